@@ -0,0 +1,314 @@
+import argparse, contextlib, csv, json, os, platform, sys, tempfile, time, timeit, tracemalloc
+from typing import Callable, Iterator
+from pylibs.csvreader import CSVReader
+from pylibs.table import Table
+from pylibs.settings import Settings
+from pylibs.uinput import Input, CaseMatcher, IteratorSource
+
+
+COLUMNS = 5 # antall kolonner i genererte csv filer
+SETTINGS_KEYS = 100 # antall instillinger i Settings scenarioene
+CASES = 100 # antall caser i Input.case scenarioene
+SYNONYMS = 10 # antall verdier per case
+
+
+def measure(run: Callable[[object], object], setup: Callable[[], object]|None = None, repeat: int = 3, number: int = 1, memory: bool = True) -> dict[str, float|int]:
+    """
+    Funksjon for å måle tid og minne for et scenario. setup kjøres før hver repetisjon og måles ikke
+
+    Parameters
+    ----------
+    run : Callable[[object], object]
+        funksjon som måles, kalles med det setup returnerer
+
+    setup : Callable[[], object]|None, optional
+        funksjon som lager ny tilstand før hver repetisjon, f.eks et nytt objekt for operasjoner som endrer data
+
+    repeat : int, optional
+        antall repetisjoner. Beste tid brukes som resultat, siden den har minst støy
+
+    number : int, optional
+        antall kall til run per repetisjon. Tiden er per kall
+
+    memory : bool, optional
+        om høyeste minnebruk skal måles med tracemalloc i en egen kjøring
+
+    Returns
+    -------
+    dict[str, float|int]
+        "seconds" (beste tid per kall), "mean" (gjennomsnitt per kall), "repeat", "number" og "peak_bytes" hvis memory er True
+    """
+
+    times: list[float] = []
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        times.append(timeit.Timer(lambda: run(state)).timeit(number) / number)
+
+    result: dict[str, float|int] = {"seconds": min(times), "mean": sum(times) / len(times), "repeat": repeat, "number": number}
+
+    if memory: # egen kjøring, siden tracemalloc gjør koden mye tregere
+        state = setup() if setup is not None else None
+        tracemalloc.start()
+        try:
+            run(state)
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+
+def generateCSV(path: str, rows: int, columns: int = COLUMNS) -> None:
+    """
+    Funksjon for å lage csv fil med én header og gitt antall rader
+
+    Parameters
+    ----------
+    path : str
+        path til filen
+
+    rows : int
+        antall rader uten header
+
+    columns : int, optional
+        antall kolonner
+    """
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([f"kolonne{column}" for column in range(columns)])
+        writer.writerows([f"r{row}c{column}" if column % 2 else str(row * column) for column in range(columns)] for row in range(rows))
+
+
+def _readCSV(path: str) -> CSVReader:
+    reader = CSVReader(path, relative_path=False)
+    reader.read(header=1)
+    return reader
+
+
+def benchCSVReader(size: int, directory: str, repeat: int, memory: bool) -> Iterator[tuple[str, dict]]:
+    """
+    Scenarioer for CSVReader.read, write, insert_column, get_column og print
+    """
+
+    path = os.path.join(directory, f"bench_{size}.csv")
+    generateCSV(path, size)
+    column = ["ny"] + ["x"] * size
+
+    yield "csvreader.read", measure(lambda _: _readCSV(path), repeat=repeat, memory=memory)
+    yield "csvreader.write", measure(lambda reader: reader.write(), lambda: _readCSV(path), repeat=repeat, memory=memory) # type: ignore
+    yield "csvreader.insert_column", measure(lambda reader: reader.insert_column(column, 1), lambda: _readCSV(path), repeat=repeat, memory=memory) # type: ignore
+    yield "csvreader.get_column", measure(lambda reader: reader.get_column(2), lambda: _readCSV(path), repeat=repeat, memory=memory) # type: ignore
+
+    def printReader(reader: CSVReader) -> None:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            reader.print()
+
+    yield "csvreader.print", measure(printReader, lambda: _readCSV(path), repeat=repeat, memory=memory) # type: ignore
+
+
+def benchTable(size: int, directory: str, repeat: int, memory: bool) -> Iterator[tuple[str, dict]]:
+    """
+    Scenarioer for Table.__str__ med og uten frame og divider. Hver repetisjon lager en ny Table, slik at kolonnebredden også måles
+    """
+
+    columnNames = [f"kolonne{column}" for column in range(COLUMNS)]
+    dataset = [[f"r{row}c{column}" for column in range(COLUMNS)] for row in range(size)]
+
+    for frame in (False, True):
+        for divider in (False, True):
+            name = "table.str" + (".frame" if frame else "") + (".divider" if divider else "")
+            yield name, measure(str, lambda: Table(columnNames, dataset, divider=divider, frame=frame), repeat=repeat, memory=memory)
+
+
+def benchSettings(size: int, directory: str, repeat: int, memory: bool) -> Iterator[tuple[str, dict]]:
+    """
+    Scenarioer for Settings.get og Settings.set med lagring til json fil. size er antall kall, men maks 1000 for .set siden hvert kall skriver filen
+    """
+
+    schema = {f"key{index}": {"default_value": 0, "options": list(range(10))} for index in range(SETTINGS_KEYS)}
+    path = os.path.join(directory, "bench_settings.json")
+
+    def makeSettings() -> Settings:
+        with open(path, "w") as f:
+            f.write("{}")
+        settings = Settings()
+        settings.init(schema)
+        settings.initJSONFile(path)
+        return settings
+
+    keys = [f"key{index % SETTINGS_KEYS}" for index in range(size)]
+    writes = keys[:1000]
+
+    def getAll(settings: Settings) -> None:
+        for key in keys:
+            settings.get(key)
+
+    def setAll(settings: Settings) -> None:
+        for index, key in enumerate(writes):
+            settings.set(key, index % 10)
+
+    def setBatch(settings: Settings) -> None:
+        with settings.batch():
+            for index, key in enumerate(keys):
+                settings.set(key, index % 10)
+
+    yield "settings.get", measure(getAll, makeSettings, repeat=repeat, memory=memory) # type: ignore
+    yield "settings.set", measure(setAll, makeSettings, repeat=repeat, memory=memory) # type: ignore
+    yield "settings.set.batch", measure(setBatch, makeSettings, repeat=repeat, memory=memory) # type: ignore
+
+
+def benchInput(size: int, directory: str, repeat: int, memory: bool) -> Iterator[tuple[str, dict]]:
+    """
+    Scenarioer for Input.case med scriptet input fra IteratorSource, med dict som kompileres per kall og med gjenbrukt CaseMatcher
+    """
+
+    cases: dict[int|str, list[str]] = {case: [f"Verdi {case} {synonym}" for synonym in range(SYNONYMS)] for case in range(CASES)}
+    answers = [f"verdi {index % CASES} {index % SYNONYMS}" for index in range(size)]
+    matcher = CaseMatcher(cases)
+
+    def caseAll(cases: dict|CaseMatcher) -> None:
+        source = IteratorSource(answers)
+        for _ in range(size):
+            Input(source=source, strictMode=True).case(cases)
+
+    yield "uinput.case.dict", measure(caseAll, lambda: cases, repeat=repeat, memory=memory)
+    yield "uinput.case.matcher", measure(caseAll, lambda: matcher, repeat=repeat, memory=memory)
+
+
+SCENARIOS: dict[str, Callable[[int, str, int, bool], Iterator[tuple[str, dict]]]] = {
+    "csvreader": benchCSVReader,
+    "table": benchTable,
+    "settings": benchSettings,
+    "uinput": benchInput,
+}
+
+
+def run(sizes: list[int], groups: list[str]|None = None, repeat: int = 3, memory: bool = True, log: Callable[[str], None]|None = print) -> dict:
+    """
+    Funksjon for å kjøre benchmark for gitte størrelser
+
+    Parameters
+    ----------
+    sizes : list[int]
+        antall rader eller kall for hvert scenario, f.eks [1000, 100000]
+
+    groups : list[str]|None, optional
+        hvilke grupper av scenarioer som kjøres (keys i SCENARIOS), alle hvis None
+
+    repeat : int, optional
+        antall repetisjoner per scenario
+
+    memory : bool, optional
+        om høyeste minnebruk skal måles
+
+    log : Callable[[str], None]|None, optional
+        funksjon for fremdrift, None for ingen
+
+    Returns
+    -------
+    dict
+        {"meta": {...}, "results": {"<scenario>[<size>]": {"seconds", "mean", "repeat", "number", "peak_bytes", "size"}}}
+
+    Raises
+    ------
+    ValueError
+        Hvis en gruppe ikke finnes
+    """
+
+    groups = list(SCENARIOS) if groups is None else groups
+    for group in groups:
+        if group not in SCENARIOS:
+            raise ValueError(f"Ukjent gruppe {group}, må være en av {list(SCENARIOS)}")
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for group in groups:
+                for name, result in SCENARIOS[group](size, directory, repeat, memory):
+                    result["size"] = size
+                    results[f"{name}[{size}]"] = result
+                    if log is not None:
+                        log(f"{name}[{size}]: {result['seconds'] * 1000:.3f} ms" + (f", {result['peak_bytes'] / 1024:.0f} KiB" if "peak_bytes" in result else ""))
+
+    return {
+        "meta": {"python": sys.version.split()[0], "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "sizes": sizes, "repeat": repeat},
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.25) -> list[tuple[str, float, float]]:
+    """
+    Funksjon for å finne scenarioer som er tregere enn i en tidligere kjøring
+
+    Parameters
+    ----------
+    report : dict
+        resultat fra run
+
+    baseline : dict
+        tidligere resultat fra run, f.eks lest fra json fil
+
+    tolerance : float, optional
+        hvor mye tregere et scenario kan være før det regnes som regresjon, 0.25 er 25%
+
+    Returns
+    -------
+    list[tuple[str, float, float]]
+        (scenario, sekunder i baseline, sekunder nå) for hver regresjon. Scenarioer som bare finnes i den ene kjøringen ignoreres
+    """
+
+    regressions: list[tuple[str, float, float]] = []
+    for name, result in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is not None and result["seconds"] > previous["seconds"] * (1 + tolerance):
+            regressions.append((name, previous["seconds"], result["seconds"]))
+
+    return regressions
+
+
+def main(argv: list[str]|None = None) -> int:
+    """
+    Kommandolinje for benchmark
+
+    Examples
+    --------
+    python -m pylibs.benchmark --sizes 1000 100000 --output current.json --baseline previous.json --tolerance 0.2
+
+    Returns
+    -------
+    int
+        exit code, 1 hvis det finnes regresjoner mot baseline
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m pylibs.benchmark", description="Benchmark for csvreader, table, settings og uinput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="antall rader eller kall, f.eks 1000 10000000")
+    parser.add_argument("--only", nargs="+", choices=list(SCENARIOS), help="bare disse gruppene")
+    parser.add_argument("--repeat", type=int, default=3, help="antall repetisjoner per scenario")
+    parser.add_argument("--no-memory", action="store_true", help="ikke mål minnebruk med tracemalloc")
+    parser.add_argument("--output", help="json fil resultatet skrives til")
+    parser.add_argument("--baseline", help="json fil fra tidligere kjøring å sammenligne med")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="tillatt økning i tid mot baseline før det regnes som regresjon")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.only, args.repeat, not args.no_memory)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+
+        for name, before, after in regressions:
+            print(f"Regresjon {name}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms (+{(after / before - 1) * 100:.0f}%)")
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
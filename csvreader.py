@@ -1,4 +1,6 @@
 import os, csv
+from pylibs.displaywidth import displayWidth, ljust
+from pylibs import instrumentation
 
 class InvalidDataStructure(Exception):
     pass
@@ -19,6 +21,9 @@ class CSVReader:
     ERROR_MODE : int
         Hvor strengt feil med datastrukturen skal rapporteres
 
+    is_validated : bool
+        Om datastrukturen er validert og ikke endret siden
+
     Methods
     -------
     check_for_errors(message)
@@ -66,6 +71,8 @@ class CSVReader:
     __ERROR_MODE: int
     __headers: list[list[str]]
     __data_set: list[list[str]]
+    __validated: bool
+    __column_lengths: list[int]|None
 
     def __init__(self, file_path: str, relative_path: bool = True) -> None:
         """
@@ -82,6 +89,8 @@ class CSVReader:
         self.__ERROR_MODE = self.ERROR_MODE_OFF
         self.__headers = [] 
         self.__data_set = [] 
+        self.__validated = False # om datastrukturen er validert siden siste endring
+        self.__column_lengths = None # cache for get_column_lengths
         
         if relative_path == True: 
             self.__file_path = os.path.realpath(os.path.join(self.__current_dir, file_path)) # abs path til fil ut fra mappe til fil som blir kjørt
@@ -126,6 +135,7 @@ class CSVReader:
         Setter metode for data_set
         """
         self.__data_set = data_set # setter data_set attributen til data_set gitt av bruker
+        self.__invalidate()
         if self.__ERROR_MODE != self.ERROR_MODE_OFF: # hvis error mode ikke er off
             try:
                 self.validate_data() # sjekker om data er gyldig
@@ -154,6 +164,7 @@ class CSVReader:
         Setter metode for headers
         """
         self.__headers = headers 
+        self.__invalidate()
 
         if self.__ERROR_MODE != self.ERROR_MODE_OFF: # hvis error mode ikke er off
             try:
@@ -165,6 +176,25 @@ class CSVReader:
                     print(e)
                 else: # raiser exception hvis ikke
                     raise e
+
+    @property
+    def is_validated(self) -> bool:
+        """
+        is_validated property. True hvis validate_data har godkjent datastrukturen og den ikke er endret med metodene til objektet siden
+
+        Returns
+        -------
+        bool
+        """
+        return self.__validated
+
+    def __invalidate(self) -> None:
+        """
+        Metode for å nullstille valideringsstatus og cachet kolonnebredde etter at datastrukturen er endret
+        """
+        self.__validated = False
+        self.__column_lengths = None
+
     def __len__(self) -> int:
         """
         Returnerer lengde av data list
@@ -175,6 +205,8 @@ class CSVReader:
         """
         Metode for å validere om data er godkjent
         """
+        started = instrumentation.start()
+        self.__validated = False
         if len(self.__headers) > 0:
             r_length = len(self.__headers[0])
 
@@ -191,7 +223,11 @@ class CSVReader:
         for index, row in enumerate(self.__data_set):
             if len(row) != r_length:
                 raise InvalidDataStructure(f"Antall kolonner for rad med index {index} stemmer ikke overens med antall kolonner gitt av headers eller første rad")
-            
+        
+        self.__validated = True
+        if started is not None:
+            instrumentation.record("csvreader.validate_data", started, rows=len(self.__headers) + len(self.__data_set))
+
     def check_for_errors(self, message: str) -> None:
         """
         Metode for å sjekke om nylig oppdatert data inneholder feil
@@ -225,6 +261,15 @@ class CSVReader:
         """
 
         self.__data_set.insert(index, row)
+        if self.__validated and len(self.__headers) > 0 and len(row) == len(self.__headers[0]): # raden passer med validert struktur, så bare oppdater cachet kolonnebredde
+            if self.__column_lengths is not None:
+                for cindex, data in enumerate(row):
+                    width = displayWidth(data)
+                    if width > self.__column_lengths[cindex]:
+                        self.__column_lengths[cindex] = width
+        else:
+            self.__invalidate()
+
         self.check_for_errors("Ugyldig data for å legge til ny rad")
 
     def remove_row(self, index: int) -> None:
@@ -238,6 +283,7 @@ class CSVReader:
         """
         try:
             self.__data_set.pop(index)
+            self.__column_lengths = None # raden kan ha vært den bredeste
 
         except IndexError as e: # catcher Index Error og printer ut melding før exception blir raised
             print(f"Ugyldig index for rad. datasettet har {len(self.__data_set)} rad(er)")
@@ -279,6 +325,7 @@ class CSVReader:
             row.insert(index, column[item_index])
             item_index += 1
         
+        self.__invalidate()
         self.check_for_errors("Ugyldig data for å legge til ny kolonne")
     
     def remove_column(self, column_index: int) -> None:
@@ -290,6 +337,7 @@ class CSVReader:
         index : int
             Indeks for kolonnen som skal fjernes
         """
+        self.__invalidate() # kolonner kan bli fjernet fra bare noen av radene hvis index er ugyldig
         try:
             for header in self.__headers: # looper gjennom hver header 
                 header.pop(column_index) # fjerner verdi med column_index
@@ -332,11 +380,15 @@ class CSVReader:
             Kolonnesperator som brukes i csv fil
     
         """
+        started = instrumentation.start()
         with open(self.__file_path, "w") as f: # åpner fil i write mode
             csv_writer = csv.writer(f, delimiter=delimiter)
             [csv_writer.writerow(header) for header in self.__headers] # skriver header
             [csv_writer.writerow(row) for row in self.__data_set] # skriver rad
 
+            if started is not None:
+                instrumentation.record("csvreader.write", started, rows=len(self.__headers) + len(self.__data_set), bytes=f.tell())
+
     def read(self, delimiter:str = ",", header: int|list[int]|None = None) -> None:
         """
         Les data fra gitt csv-fil
@@ -349,6 +401,9 @@ class CSVReader:
         header: int|list[int]|None, optional
             Hvis filen inneholder headere 
         """
+        started = instrumentation.start()
+        rows_before = len(self.__headers) + len(self.__data_set) # read legger til i eksisterende data
+        self.__invalidate()
         with open(self.__file_path, "r") as f:
             if type(header) == int:
                 header = [index for index in range(header)] #type:ignore
@@ -362,12 +417,23 @@ class CSVReader:
                     self.__headers.append(row)
                 else:
                     self.__data_set.append(row)
+
+        if started is not None:
+            instrumentation.record("csvreader.read", started, rows=len(self.__headers) + len(self.__data_set) - rows_before, bytes=os.path.getsize(self.__file_path))
    
 
     def get_column_lengths(self) -> list[int]:
         """
-        Metode for å hente lengde på kolonner fra dataset
+        Metode for å hente lengde på kolonner fra dataset. Resultatet caches til datastrukturen endres med metodene til objektet
+
+        Returns
+        -------
+        list[int]
+            Liste med visningsbredden til lengste verdi i hver kolonne
         """
+        if self.__column_lengths is not None: # bruker cachet kolonnebredde
+            return list(self.__column_lengths)
+
         if len(self.__headers) > 0:
             c_lengths = [0 for _ in range(len(self.__headers[0]))]
 
@@ -376,15 +442,18 @@ class CSVReader:
         
         for head in self.__headers:
             for cindex, data in enumerate(head):
-                if len(data) > c_lengths[cindex]:
-                    c_lengths[cindex] = len(data)
+                width = displayWidth(data) # visningsbredden tar hensyn til brede tegn som CJK og emoji
+                if width > c_lengths[cindex]:
+                    c_lengths[cindex] = width
         
         for row in self.__data_set:
             for cindex, data in enumerate(row):
-                if len(data) > c_lengths[cindex]:
-                    c_lengths[cindex] = len(data)
+                width = displayWidth(data) # visningsbredden tar hensyn til brede tegn som CJK og emoji
+                if width > c_lengths[cindex]:
+                    c_lengths[cindex] = width
 
-        return c_lengths
+        self.__column_lengths = c_lengths
+        return list(c_lengths)
 
     def print(self) -> None:
         """
@@ -402,7 +471,7 @@ class CSVReader:
 
         for header in self.__headers: # printer ut headers
             for index, data in enumerate(header):
-                print(f"{data:<{column_lengths[index] + padding}}", end="")
+                print(ljust(data, column_lengths[index] + padding), end="")
             print("")
 
         for index, clength in enumerate(column_lengths): # printer ut skiller mellom headers og datasett 
@@ -417,6 +486,6 @@ class CSVReader:
         print("")
         for row in self.__data_set: # printer ut datasettt
             for index, value in enumerate(row):
-                print(f"{value:<{column_lengths[index] + padding}}", end="")
+                print(ljust(value, column_lengths[index] + padding), end="")
 
             print("")
\ No newline at end of file
@@ -0,0 +1,96 @@
+import unicodedata
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def _wideWidth(text: str) -> int:
+    """
+    Metode for å beregne visningsbredden til tekst som ikke bare består av ASCII. Resultatet caches siden de samme verdiene ofte går igjen i en tabell
+
+    Parameters
+    ----------
+    text : str
+        tekst som skal måles
+
+    Returns
+    -------
+    int
+        antall kolonner teksten tar opp i en terminal
+    """
+
+    width = 0
+    emoji = False # siste tegn som tok opp plass var en emoji
+    joined = False # forrige tegn var zero width joiner etter en emoji, så dette tegnet tegnes sammen med emojien
+    for char in text: # looper gjennom hvert tegn
+        if joined:
+            joined = False
+            continue
+
+        if char == "\u200d": # zero width joiner. Slår sammen emoji, f.eks i familie emoji, men brukes også i f.eks indiske konsonantklynger hvor neste tegn tar opp plass
+            joined = emoji
+            continue
+
+        if "\U0001F3FB" <= char <= "\U0001F3FF": # hudfarge modifikatorer endrer emojien foran og tar ikke opp egen plass
+            continue
+
+        if unicodedata.combining(char) or unicodedata.category(char) in ("Mn", "Me", "Cf"): # kombinerende tegn og tegn uten bredde, f.eks variation selector
+            continue
+
+        wide = unicodedata.east_asian_width(char) in ("W", "F") # brede tegn, f.eks CJK og de fleste emoji
+        width += 2 if wide else 1
+        emoji = char >= "\U0001F000" or "\u2600" <= char <= "\u27bf" or (wide and unicodedata.category(char) == "So") # emoji og symboler som brukes i emoji sekvenser, f.eks ❤ i ❤️‍🔥
+
+    return width
+
+
+def displayWidth(text: str) -> int:
+    """
+    Funksjon for å returnere hvor mange kolonner en tekst tar opp i en terminal.
+    CJK og emoji tar opp to kolonner, og kombinerende tegn tar ikke opp noen
+
+    Parameters
+    ----------
+    text : str
+        tekst som skal måles
+
+    Returns
+    -------
+    int
+        visningsbredden til teksten
+
+    Examples
+    --------
+    >>> displayWidth("Blåbær")
+    6
+    >>> displayWidth("東京")
+    4
+    """
+
+    if text.isascii(): # rask vei for ren ASCII, hvor hvert tegn tar opp en kolonne
+        return len(text)
+
+    return _wideWidth(text)
+
+
+def ljust(text: str, width: int) -> str:
+    """
+    Funksjon for å fylle ut tekst med mellomrom til gitt visningsbredde, som str.ljust men tar hensyn til brede tegn
+
+    Parameters
+    ----------
+    text : str
+        tekst som skal justeres
+
+    width : int
+        visningsbredden teksten skal fylles ut til
+
+    Returns
+    -------
+    str
+        venstrejustert tekst
+    """
+
+    if text.isascii(): # rask vei for ren ASCII
+        return text.ljust(width)
+
+    return text + " " * (width - _wideWidth(text))
@@ -0,0 +1,230 @@
+import threading, logging
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import Callable
+
+
+enabled: bool = False # sjekkes av instrumenterte metoder før noe måles, slik at kostnaden er ett oppslag når instrumentering er av
+__sinks: list["MetricsSink"] = []
+
+
+class MetricsSink(ABC):
+    """
+    Base klasse for hvor målinger sendes. Subklasser implementerer .record
+    """
+
+    @abstractmethod
+    def record(self, name: str, seconds: float, counts: dict[str, int]) -> None:
+        """
+        Metode som kalles for hver måling
+
+        Parameters
+        ----------
+        name : str
+            navn på operasjonen, f.eks "csvreader.read"
+
+        seconds : float
+            tid operasjonen tok
+
+        counts : dict[str, int]
+            tellere for operasjonen, f.eks {"rows": 1000, "bytes": 52000}
+        """
+
+
+class CallbackSink(MetricsSink):
+    """
+    Sender hver måling til en funksjon
+
+    Examples
+    --------
+    >>> instrumentation.enable(CallbackSink(lambda name, seconds, counts: statsd.timing(name, seconds * 1000)))
+    """
+
+    def __init__(self, callback: Callable[[str, float, dict[str, int]], None]) -> None:
+        """
+        Initialiser CallbackSink
+
+        Parameters
+        ----------
+        callback : Callable[[str, float, dict[str, int]], None]
+            funksjon som kalles med navn, sekunder og tellere
+        """
+        self.__callback = callback
+
+
+    def record(self, name: str, seconds: float, counts: dict[str, int]) -> None:
+        self.__callback(name, seconds, counts)
+
+
+class LoggingSink(MetricsSink):
+    """
+    Skriver hver måling til en logger
+    """
+
+    def __init__(self, logger: logging.Logger|None = None, level: int = logging.DEBUG) -> None:
+        """
+        Initialiser LoggingSink
+
+        Parameters
+        ----------
+        logger : logging.Logger|None, optional
+            logger det skrives til, logger med navn "pylibs" hvis None
+
+        level : int, optional
+            log level for målingene
+        """
+        self.__logger = logger if logger is not None else logging.getLogger("pylibs")
+        self.__level = level
+
+
+    def record(self, name: str, seconds: float, counts: dict[str, int]) -> None:
+        if self.__logger.isEnabledFor(self.__level):
+            self.__logger.log(self.__level, "%s %.3f ms %s", name, seconds * 1000, " ".join(f"{key}={value}" for key, value in counts.items()))
+
+
+class SnapshotSink(MetricsSink):
+    """
+    Summerer målinger per operasjon, slik at de kan hentes med .snapshot, f.eks av et metrics system som spør med jevne mellomrom
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialiser SnapshotSink
+        """
+        self.__lock = threading.Lock()
+        self.__totals: dict[str, dict[str, float|int]] = {}
+
+
+    def record(self, name: str, seconds: float, counts: dict[str, int]) -> None:
+        with self.__lock:
+            total = self.__totals.get(name)
+            if total is None:
+                total = self.__totals[name] = {"calls": 0, "seconds": 0.0, "max_seconds": 0.0}
+
+            total["calls"] += 1
+            total["seconds"] += seconds
+            if seconds > total["max_seconds"]:
+                total["max_seconds"] = seconds
+
+            for key, value in counts.items():
+                total[key] = total.get(key, 0) + value
+
+
+    def snapshot(self, reset: bool = False) -> dict[str, dict[str, float|int]]:
+        """
+        Metode for å hente summerte målinger
+
+        Parameters
+        ----------
+        reset : bool, optional
+            om summene skal nullstilles, f.eks for å hente målinger per intervall
+
+        Returns
+        -------
+        dict[str, dict[str, float|int]]
+            per operasjon: "calls", "seconds" (sum), "max_seconds" og summen av hver teller, f.eks "rows" og "bytes"
+
+        Examples
+        --------
+        >>> sink.snapshot()
+        {'csvreader.read': {'calls': 2, 'seconds': 0.0121, 'max_seconds': 0.0069, 'rows': 2002, 'bytes': 104000}}
+        """
+
+        with self.__lock:
+            totals = {name: dict(total) for name, total in self.__totals.items()}
+            if reset:
+                self.__totals = {}
+
+        return totals
+
+
+def enable(*sinks: MetricsSink) -> None:
+    """
+    Funksjon for å skru på instrumentering og legge til sinks. Uten sinks måles ingenting selv om instrumentering er på
+
+    Parameters
+    ----------
+    *sinks : MetricsSink
+        sinks som skal få målingene
+
+    Raises
+    ------
+    TypeError
+        Hvis en sink ikke er en MetricsSink
+    """
+
+    global enabled, __sinks
+    for sink in sinks:
+        if not isinstance(sink, MetricsSink):
+            raise TypeError(f"sink må være av typen MetricsSink, ikke {type(sink).__name__}")
+
+    __sinks = __sinks + list(sinks) # ny liste, slik at .record i andre tråder ikke ser en halvveis endring
+    enabled = True
+
+
+def disable() -> None:
+    """
+    Funksjon for å skru av instrumentering og fjerne alle sinks
+    """
+
+    global enabled, __sinks
+    enabled = False
+    __sinks = []
+
+
+def removeSink(sink: MetricsSink) -> None:
+    """
+    Funksjon for å fjerne én sink. Instrumentering skrus av når siste sink fjernes
+
+    Raises
+    ------
+    ValueError
+        Hvis sink ikke er lagt til
+    """
+
+    global enabled, __sinks
+    sinks = list(__sinks)
+    sinks.remove(sink)
+    __sinks = sinks
+    enabled = len(sinks) > 0
+
+
+def start() -> float|None:
+    """
+    Funksjon for å starte en måling
+
+    Returns
+    -------
+    float|None
+        starttid som gis til record, eller None hvis instrumentering er av
+
+    Examples
+    --------
+    >>> started = instrumentation.start()
+    >>> ... # operasjonen som måles
+    >>> if started is not None:
+    ...     instrumentation.record("csvreader.read", started, rows=rows)
+    """
+
+    return perf_counter() if enabled else None
+
+
+def record(name: str, started: float, **counts: int) -> None:
+    """
+    Funksjon for å avslutte en måling og sende den til alle sinks
+
+    Parameters
+    ----------
+    name : str
+        navn på operasjonen
+
+    started : float
+        starttid fra start
+
+    **counts : int
+        tellere for operasjonen, f.eks rows=1000
+    """
+
+    seconds = perf_counter() - started
+    for sink in __sinks:
+        sink.record(name, seconds, counts)
@@ -1,5 +1,10 @@
-import json, os
+import threading, atexit, weakref, time, re, sys
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
 from pylibs.uinput import Input 
+from pylibs.settingsstorage import SettingsStorage, JSONStorage
+from pylibs import instrumentation
 
 
 class NotInitializedError(Exception):
@@ -11,34 +16,193 @@ class NotInitializedError(Exception):
 
 class NotInitializedJSONFileError(Exception):
     """
-    Exception som kan bli raised hvis Settings objekt må ha blitt initialisert for JSON fil før en gitt metode kalles
+    Exception som kan bli raised hvis Settings objekt må ha blitt initialisert for JSON fil eller annen lagring før en gitt metode kalles
     """
     pass
 
 
-class Settings:
+class InvalidStoredSettingsError(Exception):
     """
-    Klasse for å lage et settings objekt for å tracke ulike settings og lagre de
+    Exception som blir raised når lagrede instillinger er ugyldige og LOAD_POLICY er Settings.LOAD_POLICY_RAISE.
+    Alle avviste instillinger ligger i rejected som en liste med (key, verdi, grunn)
     """
 
-    def __init__(self) -> None:
-        self.__initialized: bool = False
-        self.__initializedJSONFile: bool = False
-        self.__json_path: str = ""
+    def __init__(self, message: str, rejected: list[tuple[str, object, str]]) -> None:
+        super().__init__(message)
+        self.rejected = rejected
 
 
-    def init(self, settings: dict[str, dict[str, object]]) -> None:
+class OptionDomain(ABC):
+    """
+    Baseklasse for options som beskrives av en regel i stedet for en liste med alle verdiene, slik at store domener ikke må lages i minnet.
+    Kan brukes som "options" i Settings.init, og sjekker om en verdi er gyldig med O(1) "in"
+    """
+
+    @abstractmethod
+    def __contains__(self, value: object) -> bool:
         """
-        Metode for å initialisere hvilke settings objektet skal tracke
+        Metode for å sjekke om value er en gyldig verdi
+        """
+
+
+class Interval(OptionDomain):
+    """
+    Tall mellom min og max, inkludert begge. Hvis step er gitt er bare min, min + step, min + 2 * step osv. gyldige, og verdiene kan hentes med .getOption
+
+    Examples
+    --------
+    >>> settings.init({"port": {"default_value": 8080, "options": Interval(0, 65535, 1)}})
+    """
+
+    def __init__(self, min: int|float, max: int|float, step: int|float|None = None) -> None:
+        """
+        Parameters
+        ----------
+        min : int|float
+            minste gyldige verdi
+
+        max : int|float
+            største gyldige verdi
+
+        step : int|float|None, optional
+            avstand mellom gyldige verdier, alle verdier mellom min og max er gyldige hvis None
+
+        Raises
+        ------
+        ValueError
+            Hvis max er mindre enn min eller step ikke er positiv
+        """
+
+        if max < min:
+            raise ValueError(f"max ({max}) kan ikke være mindre enn min ({min})")
+
+        if step is not None and step <= 0:
+            raise ValueError(f"step må være positiv, ikke {step}")
+
+        self.min = min
+        self.max = max
+        self.step = step
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, (int, float)) or isinstance(value, bool): # bare tall er gyldige
+            return False
+
+        if not self.min <= value <= self.max:
+            return False
+
+        if self.step is None:
+            return True
+
+        steps = (value - self.min) / self.step
+        return abs(steps - round(steps)) < 1e-9 # tåler avrundingsfeil for float
+
+    def __len__(self) -> int:
+        if self.step is None:
+            raise TypeError(f"{self} har ingen step og derfor ikke et bestemt antall verdier")
+
+        return int((self.max - self.min) / self.step + 1e-9) + 1 # tåler avrundingsfeil for float
+
+    def __getitem__(self, index: int) -> int|float:
+        length = len(self)
+        if not -length <= index < length:
+            raise IndexError(f"index {index} er ute av range for {self}")
+
+        return self.min + (index % length) * self.step # type: ignore
+
+    def __repr__(self) -> str:
+        return f"Interval({self.min}, {self.max}, step={self.step})"
+
+
+class Pattern(OptionDomain):
+    """
+    Strings som matcher et regulært uttrykk i sin helhet
+
+    Examples
+    --------
+    >>> settings.init({"locale": {"default_value": "nb_NO", "options": Pattern(r"[a-z]{2}_[A-Z]{2}")}})
+    """
+
+    def __init__(self, pattern: str|re.Pattern[str]) -> None:
+        """
+        Parameters
+        ----------
+        pattern : str|re.Pattern[str]
+            regulært uttrykk som hele verdien må matche
+        """
+
+        self.pattern = re.compile(pattern)
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, str) and self.pattern.fullmatch(value) is not None
+
+    def __repr__(self) -> str:
+        return f"Pattern({self.pattern.pattern!r})"
+
+
+class Predicate(OptionDomain):
+    """
+    Verdier som en gitt funksjon godkjenner
+
+    Examples
+    --------
+    >>> settings.init({"workers": {"default_value": 4, "options": Predicate(lambda value: isinstance(value, int) and value % 2 == 0, "partall")}})
+    """
+
+    def __init__(self, predicate: Callable[[object], bool], description: str = "") -> None:
+        """
+        Parameters
+        ----------
+        predicate : Callable[[object], bool]
+            funksjon som returnerer True for gyldige verdier
+
+        description : str, optional
+            beskrivelse av gyldige verdier, brukes i feilmeldinger
+        """
+
+        self.predicate = predicate
+        self.description = description
+
+    def __contains__(self, value: object) -> bool:
+        try:
+            return bool(self.predicate(value))
+        except (TypeError, ValueError): # verdien har feil type for funksjonen
+            return False
+
+    def __repr__(self) -> str:
+        return f"Predicate({self.description or getattr(self.predicate, '__qualname__', self.predicate)})"
+
+
+class _RangeDomain(OptionDomain):
+    """
+    Range som options. range sjekker bare int med O(1) "in", og går gjennom hele rangen for andre typer, f.eks float fra json.
+    Bare int (ikke bool) slippes derfor videre til range
+    """
+
+    def __init__(self, options: range) -> None:
+        self.__range = options
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, int) and not isinstance(value, bool) and value in self.__range
+
+    def __repr__(self) -> str:
+        return repr(self.__range)
+
+
+class CompiledSchema:
+    """
+    Validert og kompilert versjon av settings param til Settings.init. Kan lages én gang, f.eks som konstant i en modul, 
+    og gis til .init for mange Settings objekter, slik at skjemaet bare valideres og kompileres én gang per prosess
+    """
+
+    def __init__(self, settings: dict[str, dict[str, object]]) -> None:
+        """
+        Valider og kompiler skjema
 
         Parameters
         ----------
         settings : dict[str, dict[str, object]]
-            Dictionary med hvilke innstillinger som objektet skal tracke
-            Key til key-value-pair dict er navnet på instillingen som skal trackes, og kan senere brukes som key for .get og .set metode. 
-            Value i key-value-pair må også være et dict med keys "default_value" for standardverdi, og "options" for alle mulige verdiene for instillingen. Ønsker du at 
-            en option skal returnere f.eks en referanse til en funksjon bruker du en dict med key for navnet på option og value som return verdi 
-        
+            Dictionary med hvilke innstillinger som skal trackes, se Settings.init
+
         Raises
         ------
         TypeError
@@ -48,21 +212,37 @@ class Settings:
             Hvis settings param ikke har riktig format
 
         Examples
-        -------
+        --------
+        >>> SCHEMA = CompiledSchema({"volume_level": {"default_value": 5, "options": range(11)}})
         >>> settings = Settings()
-        >>> settings.init(
-            {
-                "img_size": {"default_value": "large", "options": [{"large": refToLargeFunc},{"medium": refToMediumFunc},{"small": refToSmallFunc}]},
-                "volume_level": {"default_value": 5 , "options": [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10]},
-                "toggle": {"default_value": True , "options": [True, False]},
-            }
-        ) 
+        >>> settings.init(SCHEMA)
         """
 
         if type(settings) != dict: # sjekker om settings param ikke er av riktig type
             raise TypeError(f"settings param må være av typen dict ikke {type(settings)}")
 
-        self.__settings: dict[str, dict[str, object]] = dict()
+        CompiledSchema.__validate(settings)
+
+        self.settings: dict[str, dict[str, object]] = dict() # kompilerte options for hver key. Deles av alle Settings objekter med skjemaet
+        self.defaults: dict[str, object] = dict() # default_value for hver key
+        for key, value in settings.items():
+            self.settings[key] = {"options": value["options"], **CompiledSchema.__compileOptions(value["options"])} # type: ignore
+            self.defaults[key] = value["default_value"]
+
+    @staticmethod
+    def __validate(settings: dict[str, dict[str, object]]) -> None:
+        """
+        Metode for å validere skjemaet
+
+        Raises
+        ------
+        TypeError
+            Hvis value i key-value-pairs i settings ikke er av typen dict
+        
+        ValueError
+            Hvis settings param ikke har riktig format
+        """
+
         for key, value in settings.items():
             if type(value) != dict: # sjekker om verdien av key-value pair i settings ikke er av riktig type
                 raise TypeError(f'Verdien av key-value pairs må være av typen dict for settings param ikke {type(value)} for key "{key}"')
@@ -73,9 +253,22 @@ class Settings:
             if "options" not in value.keys(): # sjekker om key med options mangler
                 raise ValueError(f'Dictionary for key "{key}" må ha en key-value-pair med key "options" for å fastsette hvilke verdier instillingen "{key}" kan ha')
 
+            if type(value["options"]) in (range, frozenset) or isinstance(value["options"], OptionDomain): # domene som sjekkes med "in"
+                domain = _RangeDomain(value["options"]) if type(value["options"]) == range else value["options"] # type: ignore
+                if value["default_value"] not in domain: # type: ignore
+                    raise ValueError(f'"default_value" med verdi {value["default_value"]} i dictionary med key "{key}" må være i "options" {value["options"]}')
+
+                continue
+
             if type(value["options"]) != list:
-                raise ValueError(f'Typen av "options" i dictionary med key "{key}" må være av typen list ikke {type(value["options"])}')
+                raise ValueError(f'Typen av "options" i dictionary med key "{key}" må være av typen list, range, frozenset eller OptionDomain ikke {type(value["options"])}')
             
+            if dict not in map(type, value["options"]): # type: ignore ingen options av typen dict, så "in" gir samme svar som å gå gjennom listen
+                if value["default_value"] not in value["options"]: # type: ignore
+                    raise ValueError(f'"default_value" med verdi {value["default_value"]} i dictionary med key "{key}" må være representert i "options" som verdi i listen eller som key i en av key-value-pair veriene i listen')
+
+                continue
+
             defaultValuePresentedInOptions = False
             for index, option in enumerate(value["options"]): # type: ignore
                 if type(option) == dict: # sjekker om typen av option er dict
@@ -96,13 +289,221 @@ class Settings:
             
             if not defaultValuePresentedInOptions: # default value er ikke presentert i listen med options
                 raise ValueError(f'"default_value" med verdi {value["default_value"]} i dictionary med key "{key}" må være representert i "options" som verdi i listen eller som key i en av key-value-pair veriene i listen')
-                        
-            self.__settings[key] = {"value": value["default_value"], "options": value["options"] } # type: ignore data for gitt key er gyldig så legg til i settings dictionary
-                
+
+    @staticmethod
+    def __compileOptions(options: list[object]|range|frozenset[object]|OptionDomain) -> dict[str, object]:
+        """
+        Metode for å lage oppslagstabeller for options slik at Settings.get, .set og .getOption slipper å gå gjennom hele listen
+
+        Parameters
+        ----------
+        options : list[object]|range|frozenset[object]|OptionDomain
+            options til en instilling
+
+        Returns
+        -------
+        dict[str, object]
+            "returns": dict fra lagret verdi til return verdi for options av typen dict
+            "allowed": objekt som støtter "in" med alle gyldige verdier, eller None hvis en av verdiene ikke er hashable og listen må gås gjennom
+            "pairs": liste med (lagret verdi, return verdi) for hver option, eller None hvis options kan indekseres direkte
+        """
+
+        if type(options) == range: # O(1) "in" også for verdier som ikke er int
+            return {"returns": {}, "allowed": _RangeDomain(options), "pairs": None}
+
+        if type(options) != list: # frozenset og OptionDomain støtter allerede "in" uten å lage listen
+            return {"returns": {}, "allowed": options, "pairs": None}
+
+        if dict not in map(type, options): # ingen options av typen dict, så listen kan brukes direkte av .getOption
+            try:
+                return {"returns": {}, "allowed": set(options), "pairs": None}
+            except TypeError: # en av verdiene er ikke hashable, så .set må gå gjennom listen
+                return {"returns": {}, "allowed": None, "pairs": None}
+
+        returns: dict[object, object] = {}
+        pairs: list[tuple[object, object]] = []
+        storedValues: list[object] = [] # alle verdier som kan settes
+        for option in options:
+            if type(option) == dict:
+                if len(option) == 0: # tom dict kan ikke velges som verdi
+                    pairs.append(())  # type: ignore gir IndexError i .getOption
+                    continue
+
+                storedValue, returnValue = next(iter(option.items())) # type: ignore
+                returns.setdefault(storedValue, returnValue) # første option med gitt key gjelder, som ved å gå gjennom listen
+                pairs.append((storedValue, returnValue))
+                storedValues.append(storedValue)
+
+            else:
+                pairs.append((option, option))
+                storedValues.append(option)
+
+        try:
+            allowed: set[object]|None = set(storedValues)
+        except TypeError: # en av verdiene er ikke hashable, så .set må gå gjennom listen
+            allowed = None
+
+        return {"returns": returns, "allowed": allowed, "pairs": pairs}
+
+
+def _flushAtExit(reference: "weakref.ref[Settings]") -> Callable[[], None]:
+    """
+    Funksjon for å lage en atexit hook som skriver endringer som venter i et Settings objekt, men bare holder en weakref til objektet
+
+    Parameters
+    ----------
+    reference : weakref.ref[Settings]
+        weakref til objektet
+    """
+
+    def flush() -> None:
+        settings = reference()
+        if settings is not None:
+            settings.flush()
+
+    return flush
+
+
+class Settings:
+    """
+    Klasse for å lage et settings objekt for å tracke ulike settings og lagre de
+
+    Attributes
+    ----------
+    LOAD_POLICY : int
+        Hva som skjer når lagrede instillinger er ugyldige ved innlasting. Alle ugyldige instillinger samles først, deretter brukes policy på alle samtidig
+        Settings.LOAD_POLICY_PROMPT: spør bruker om lagringen skal nullstilles. Hvis stdin ikke er en terminal brukes LOAD_POLICY_SKIP, slik at innlasting aldri blokkerer
+        Settings.LOAD_POLICY_SKIP: ugyldige instillinger ignoreres og beholder standardverdien
+        Settings.LOAD_POLICY_DEFAULT: ugyldige instillinger settes til standardverdien og skrives tilbake til lagringen
+        Settings.LOAD_POLICY_RESET: lagringen nullstilles
+        Settings.LOAD_POLICY_RAISE: raiser InvalidStoredSettingsError med alle ugyldige instillinger
+    """
+
+    LOAD_POLICY_PROMPT = 0 # standard, spør bruker
+    LOAD_POLICY_SKIP = 1
+    LOAD_POLICY_DEFAULT = 2
+    LOAD_POLICY_RESET = 3
+    LOAD_POLICY_RAISE = 4
+    LOAD_POLICIES = [LOAD_POLICY_PROMPT, LOAD_POLICY_SKIP, LOAD_POLICY_DEFAULT, LOAD_POLICY_RESET, LOAD_POLICY_RAISE]
+    __LOAD_POLICY: int
+
+    def __init__(self, concurrent: bool = False) -> None:
+        """
+        Initialiser Settings
+
+        Parameters
+        ----------
+        concurrent : bool, optional
+            Om objektet skal brukes fra flere tråder samtidig. Da lager hver endring en ny kopi av verdiene som byttes inn atomisk (copy-on-write),
+            slik at .get aldri tar en lås eller ser en halvveis endring, mens .set blir O(antall instillinger).
+            Innlasting, reload og .batch lager bare én kopi, og andre tråder ser endringene i en .batch først når den ytterste blokken avsluttes.
+            .set fra andre tråder venter til en aktiv .batch er ferdig
+        """
+
+        self.__initialized: bool = False
+        self.__concurrent = concurrent
+        self.__values: dict[str, object] = {} # verdien til hver instilling. Byttes ut i sin helhet i concurrent modus
+        self.__staged: dict[str, object]|None = None # kopi som samler endringene i en innlasting, reload eller .batch i concurrent modus, byttes inn én gang til slutt
+        self.__stagedBy: int|None = None # tråden som eier kopien, og som ser sine egne endringer med .get
+        self.__initializedStorage: bool = False
+        self.__storage: SettingsStorage|None = None # hvor instillingene lagres
+        self.__writeLock = threading.RLock() # serialiserer endringer og skriving til lagring. Tas aldri av .get
+        self.__batchDepth: int = 0 # antall aktive .batch blokker
+        self.__changedKeys: set[str] = set() # keys som er endret men ikke skrevet til fil
+        self.__writeDelay: float|None = None # forsinkelse for write-behind, None for å skrive med en gang
+        self.__writeTimer: threading.Timer|None = None
+        self.__exitHook: weakref.finalize|None = None # fjerner .flush ved programslutt fra atexit når objektet slettes eller lagringen byttes
+        self.__listeners: list[Callable[[str, object, object], None]] = [] # kalles med (key, gammel verdi, ny verdi) ved endringer
+        self.__keySubscribers: dict[str, list[Callable[[str, object, object], None]]] = {} # subscribers for én key
+        self.__prefixSubscribers: dict[str, list[Callable[[str, object, object], None]]] = {} # subscribers for alle keys som starter med prefix, "" for alle keys
+        self.__prefixLengths: tuple[int, ...] = () # lengdene til prefixene, slik at hver endring bare slår opp key[:lengde] for hver lengde
+        self.__subscriptions: dict[int, tuple[dict[str, list[Callable[[str, object, object], None]]], str, Callable[[str, object, object], None]]] = {}
+        self.__nextSubscriptionId: int = 0
+        self.__pendingNotifications: dict[str, tuple[object, object]] = {} # key -> (verdi før batch, siste verdi) for endringer i en aktiv .batch
+        self.__reloadInterval: float|None = None # minste tid mellom hver sjekk for endringer i lagringen ved .get, None for av
+        self.__nextReloadCheck: float = 0.0 # time.monotonic() for neste sjekk
+        self.__LOAD_POLICY = self.LOAD_POLICY_PROMPT
+        self.__rejectedEntries: list[tuple[str, object, str]] = [] # ugyldige instillinger fra siste innlasting
+
+
+    @property
+    def LOAD_POLICY(self) -> int:
+        """
+        LOAD_POLICY property
+        
+        Returns
+        -------
+        int
+            LOAD_POLICY
+        """
+        return self.__LOAD_POLICY
+
+    @LOAD_POLICY.setter
+    def LOAD_POLICY(self, policy: int) -> None:
+        """
+        Setter metode for LOAD_POLICY property
+        """
+        if policy not in self.LOAD_POLICIES: # hvis bruker prøver å sette LOAD_POLICY til en ikke godkjent verdi, raise Exception
+            raise ValueError(f"LOAD_POLICY kan være {self.LOAD_POLICIES}, ikke {policy}")
+
+        self.__LOAD_POLICY = policy
+
+
+    @property
+    def rejectedEntries(self) -> list[tuple[str, object, str]]:
+        """
+        Ugyldige instillinger fra siste innlasting fra lagringen som (key, verdi, grunn)
+
+        Returns
+        -------
+        list[tuple[str, object, str]]
+            kopi av listen med avviste instillinger
+        """
+        return list(self.__rejectedEntries)
+
+
+    def init(self, settings: dict[str, dict[str, object]]|CompiledSchema) -> None:
+        """
+        Metode for å initialisere hvilke settings objektet skal tracke
+
+        Parameters
+        ----------
+        settings : dict[str, dict[str, object]]|CompiledSchema
+            Dictionary med hvilke innstillinger som objektet skal tracke, eller CompiledSchema som allerede er validert
+            Key til key-value-pair dict er navnet på instillingen som skal trackes, og kan senere brukes som key for .get og .set metode. 
+            Value i key-value-pair må også være et dict med keys "default_value" for standardverdi, og "options" for alle mulige verdiene for instillingen. Ønsker du at 
+            en option skal returnere f.eks en referanse til en funksjon bruker du en dict med key for navnet på option og value som return verdi.
+            Store domener kan gis som range, frozenset eller OptionDomain (Interval, Pattern, Predicate) i stedet for en liste
+        
+        Raises
+        ------
+        TypeError
+            Hvis typen av settings param ikke er dict og hvis value i key-value-pairs i settings ikke er av typen dict
+        
+        ValueError
+            Hvis settings param ikke har riktig format
+
+        Examples
+        -------
+        >>> settings = Settings()
+        >>> settings.init(
+            {
+                "img_size": {"default_value": "large", "options": [{"large": refToLargeFunc},{"medium": refToMediumFunc},{"small": refToSmallFunc}]},
+                "volume_level": {"default_value": 5 , "options": [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10]},
+                "toggle": {"default_value": True , "options": [True, False]},
+                "port": {"default_value": 8080, "options": range(0, 65536)},
+            }
+        ) 
+        """
+
+        schema = settings if isinstance(settings, CompiledSchema) else CompiledSchema(settings) # validerer og kompilerer hvis skjemaet ikke allerede er kompilert
+        self.__settings = schema.settings
+        self.__defaults = schema.defaults
+        self.__values = dict(schema.defaults)
         self.__initialized = True # setter attribute for initalisation til True da alt gikk vellykket
     
 
-    def initJSONFile(self, json_path: str) -> None:
+    def initJSONFile(self, json_path: str, writeDelay: float|None = None) -> None:
         """
         Metode for å knytte settings objektet til json fil for å synce instillingene
 
@@ -110,6 +511,11 @@ class Settings:
         ----------
         json_path : str
             path til json fil
+
+        writeDelay : float|None, optional
+            Antall sekunder endringer samles før de skrives til fil (write-behind). Alle endringer innenfor forsinkelsen gir én skriving.
+            Endringer som ikke er skrevet kan skrives med en gang med .flush, og blir skrevet når programmet avsluttes.
+            Hvis None skrives filen ved hver .set
         
         Raises
         ------
@@ -123,15 +529,66 @@ class Settings:
         if not self.__initialized: # sjekker om objektet ikke er initialisert
             raise NotInitializedError(f"Settings objektet {self} må være initialisert med .init method før .initJSONFile method kan kalles")
 
-        if not os.path.isfile(json_path): # sjekker om det eksisterer en fil med gitt path
-            raise ValueError(f'Det finnes ingen fil med path "{json_path}" fra cwd "{os.getcwd()}"')
+        self.initStorage(JSONStorage(json_path), writeDelay)
 
-        if not json_path.endswith(".json"): # sjekker om fil er av typen json
-            raise ValueError(f'Filen må være json fil, ikke {json_path.split(".")[-1:]} fil')
 
-        self.__json_path = json_path 
-        self.__initializedJSONFile = True
-        self.__getStoredSettings() # henter lagrede innstillinger
+    def initStorage(self, storage: SettingsStorage, writeDelay: float|None = None) -> None:
+        """
+        Metode for å knytte settings objektet til en lagring for å synce instillingene, f.eks JournalStorage for instillinger som endres ofte
+
+        Parameters
+        ----------
+        storage : SettingsStorage
+            lagringen instillingene hentes fra og skrives til
+
+        writeDelay : float|None, optional
+            Antall sekunder endringer samles før de skrives (write-behind). Se .initJSONFile
+        
+        Raises
+        ------
+        NotInitializedError
+            Hvis objektet ikke har blit initialiser med .init metoden
+
+        ValueError
+            Hvis writeDelay er negativ
+
+        InvalidStoredSettingsError
+            Hvis lagrede instillinger er ugyldige og LOAD_POLICY er LOAD_POLICY_RAISE. Objektet er da som før kallet, uten den nye lagringen
+
+        Examples
+        --------
+        >>> settings.initStorage(JournalStorage("settings.json", compactEvery = 500))
+        """
+
+        if not self.__initialized: # sjekker om objektet ikke er initialisert
+            raise NotInitializedError(f"Settings objektet {self} må være initialisert med .init method før .initStorage method kan kalles")
+
+        if writeDelay is not None and writeDelay < 0:
+            raise ValueError(f"writeDelay kan ikke være negativ, fikk {writeDelay}")
+
+        with self.__writeLock:
+            previous = (self.__storage, self.__initializedStorage, self.__writeDelay, dict(self.__values))
+            self.__storage = storage
+            self.__initializedStorage = True
+            self.__writeDelay = writeDelay
+
+        try:
+            self.__getStoredSettings() # henter lagrede innstillinger
+
+        except InvalidStoredSettingsError: # ruller tilbake, slik at objektet ikke skriver halvveis innlastede verdier til lagringen
+            with self.__writeLock:
+                self.__storage, self.__initializedStorage, self.__writeDelay, self.__values = previous
+            raise
+
+        if self.__exitHook is not None: # lagringen er byttet, forrige hook fjernes
+            self.__exitHook()
+            self.__exitHook = None
+
+        if writeDelay is not None: # skriver endringer som venter når programmet avsluttes, uten å holde objektet i live
+            hook = _flushAtExit(weakref.ref(self))
+            atexit.register(hook)
+            self.__exitHook = weakref.finalize(self, atexit.unregister, hook)
+            self.__exitHook.atexit = False
 
 
     def get(self, key: str, literalValue: bool = False) -> object:
@@ -160,18 +617,26 @@ class Settings:
         if not self.__initialized: # hvis ikke objektet er initialisert
             raise NotInitializedError(f"Settings objektet {self} må være initialisert med .init method før .get method kan kalles")
         
+        if self.__reloadInterval is not None and time.monotonic() >= self.__nextReloadCheck: # sjekker om lagringen er endret av andre
+            self.__nextReloadCheck = time.monotonic() + self.__reloadInterval
+            self.checkForChanges()
+
         if key not in self.__settings.keys(): # sjekker om objektet har key-value-pair med gitt key
             raise KeyError(f'Settings har ikke key-value-pair med key "{key}"')
 
+        values = self.__values
+        staged = self.__staged
+        if staged is not None and self.__stagedBy == threading.get_ident(): # tråden er inne i sin egen .batch i concurrent modus og ser sine endringer
+            values = staged
+
+        value = values[key] # leser fra gjeldende snapshot uten lås
         if literalValue: # hvis faktiske verdi skal returnees
-            return self.__settings[key]["value"]
+            return value
 
-        for option in self.__settings[key]["options"]: # type: ignore Looper gjennom hver option    
-            if type(option) == dict: # hvis option er av typen dict
-                if list(option)[0] == self.__settings[key]["value"]: # hvis key til option er samme som verdien i settings med gitt key 
-                    return option[self.__settings[key]["value"]] # returner option gitte return value
-            
-        return self.__settings[key]["value"] # hvis ikke finner option med key lik value, returner vlue
+        try:
+            return self.__settings[key]["returns"].get(value, value) # type: ignore returner return value for option med key lik value, ellers value
+        except TypeError: # value er ikke hashable og kan derfor ikke være key til en option
+            return value
 
     
     def getOption(self, key: str, index: int, literalValue: bool = False) -> object:
@@ -201,6 +666,9 @@ class Settings:
 
         IndexError
             hvis index er ute av range til options list
+
+        TypeError
+            hvis options er et domene uten rekkefølge, f.eks frozenset eller Pattern
         
         KeyError
             hvis objektet ikke har en key-value-pair med gitt key
@@ -212,11 +680,15 @@ class Settings:
         if key not in self.__settings.keys(): # sjekker om objektet har key-value-pair med gitt key
             raise KeyError(f'Settings har ikke key-value-pair med key "{key}"')
 
+        pairs = self.__settings[key]["pairs"]
         try:
-            if type(self.__settings[key]["options"][index]) != dict: #  type: ignore Så lenge at typen av option ikke er dict, returner option da option ikke har en annen returnvalue
-                return self.__settings[key]["options"][index] # type: ignore
-            else:
-                return list(self.__settings[key]["options"][index].items())[0][0 if literalValue else 1] # type: ignore Returnerer option key hvis literalValue er true, ellers returnvalue for option
+            if pairs is None: # liste uten dict options eller domene, f.eks range eller Interval med step
+                try:
+                    return self.__settings[key]["options"][index] # type: ignore
+                except TypeError:
+                    raise TypeError(f'Options for "{key}" ({self.__settings[key]["options"]}) har ingen rekkefølge og kan ikke hentes med index')
+
+            return pairs[index][0 if literalValue else 1] # type: ignore Returnerer option key hvis literalValue er true, ellers returnvalue for option. For options som ikke er dict er begge lik option
 
         except IndexError:
             raise IndexError(f'Settings objektet med attribute {key} har ingen option med index {index}. Max index er {len(self.__settings[key]["options"])}') # type: ignore
@@ -249,29 +721,439 @@ class Settings:
         if not self.__initialized: # hvis ikke objektet er initialisert
             raise NotInitializedError(f"Settings objektet {self} må være initialisert med .init methode før .set methode kan kalles")
 
+        with self.__writeLock: # bare én endring om gangen, slik at verdier og lagring endres i samme rekkefølge
+            oldValue = self.__currentValues().get(key)
+            self.__setValue(key, value)
+            if self.__initializedStorage:
+                self.__persist(key) # oppdater json fil nå, ved slutten av .batch eller etter writeDelay
+
+        if oldValue != value:
+            self.__publish([(key, oldValue, value)])
+
+
+    def __setValue(self, key: str, value: object) -> None:
+        """
+        Metode for å validere og sette verdi for key-value-pair uten å skrive til fil
+
+        Parameters
+        ----------
+        key : str
+            key til key-value-pair
+        
+        value : object
+            verdien som skal bli satt til key-value-pair
+
+        Raises
+        ------
+        KeyError
+            hvis objektet ikke har en key-value-pair med gitt key
+
+        ValueError
+            hvis value param ikke er presentert i options list og dermed ikke er gyldig
+        """
+
         if key not in self.__settings.keys(): # sjekker om objektet har key-value-pair med gitt key
             raise KeyError(f'Settings har ikke key-value-pair med key "{key}"')
 
         validValue = False # om ny verdi er gyldig
-        for option in self.__settings[key]["options"]: # type: ignore Looper gjennom hver option i options list
-            if type(option) == dict: # hvis option er dict
-                if list(option)[0] == value: # sjekker om verdi er lik key til key-value-pair i option
+        allowed = self.__settings[key]["allowed"]
+        if allowed is not None: # oppslag i set med gyldige verdier
+            try:
+                validValue = value in allowed # type: ignore
+            except TypeError: # value er ikke hashable og kan derfor ikke være i set
+                validValue = False
+
+        else: # options inneholder verdier som ikke er hashable
+            for option in self.__settings[key]["options"]: # type: ignore Looper gjennom hver option i options list
+                if type(option) == dict: # hvis option er dict
+                    if list(option)[0] == value: # sjekker om verdi er lik key til key-value-pair i option
+                        validValue = True
+                        break
+
+                elif option == value: # sjekker om den nye verdien er lik option
                     validValue = True
                     break
 
-            elif option == value: # sjekker om den nye verdien er lik option
-                validValue = True
-                break
-
         if validValue: # hvis den nye verdien er gyldig
-            self.__settings[key]["value"] = value # sett ny verdi til verdi
-            if self.__initializedJSONFile:
-                self.__updateStoredSettings() # oppdater json fil
+            if self.__staged is not None: # samles i kopien som byttes inn når innlasting, reload eller .batch er ferdig
+                self.__staged[key] = value
+
+            elif self.__concurrent: # lager ny kopi med endringen og bytter den inn, slik at lesere alltid ser en hel snapshot
+                values = dict(self.__values)
+                values[key] = value
+                self.__values = values
+
+            else:
+                self.__values[key] = value # sett ny verdi til verdi
 
         else: # ikke gyldig verdi
-            raise ValueError(f'Ugyldig verdi for value med key "{key}". Verdi må være {[list(option)[0] for option in self.__settings[key]["options"]] if type(self.__settings[key]["options"][0]) == dict else self.__settings[key]["options"]}') # type: ignore
+            options = self.__settings[key]["options"]
+            raise ValueError(f'Ugyldig verdi for value med key "{key}". Verdi må være {[list(option)[0] for option in options] if type(options) == list and type(options[0]) == dict else options}') # type: ignore
     
 
+    def __currentValues(self) -> dict[str, object]:
+        """
+        Metode for å hente verdiene endringer skal gjøres mot, altså kopien hvis endringer samles i concurrent modus. Kalles med __writeLock
+        """
+
+        return self.__staged if self.__staged is not None else self.__values
+
+
+    def __beginStaging(self) -> bool:
+        """
+        Metode for å begynne å samle endringer i én kopi i concurrent modus, slik at mange endringer koster én kopi i stedet for én per endring.
+        Kalles med __writeLock
+
+        Returns
+        -------
+        bool
+            True hvis en ny kopi ble laget og må byttes inn med .__commitStaging
+        """
+
+        if not self.__concurrent or self.__staged is not None: # ikke concurrent, eller endringer samles allerede
+            return False
+
+        self.__staged = dict(self.__values)
+        self.__stagedBy = threading.get_ident()
+        return True
+
+
+    def __commitStaging(self) -> None:
+        """
+        Metode for å bytte inn kopien fra .__beginStaging atomisk. Kalles med __writeLock
+        """
+
+        self.__values = self.__staged # type: ignore
+        self.__staged = None
+        self.__stagedBy = None
+
+
+    def addListener(self, callback: Callable[[str, object, object], None]) -> None:
+        """
+        Metode for å legge til en funksjon som kalles når en instilling endres med .set eller ved reload fra lagringen
+
+        Parameters
+        ----------
+        callback : Callable[[str, object, object], None]
+            funksjon som kalles med key, gammel verdi og ny verdi
+        """
+
+        self.__listeners.append(callback)
+
+
+    def removeListener(self, callback: Callable[[str, object, object], None]) -> None:
+        """
+        Metode for å fjerne en funksjon lagt til med .addListener
+
+        Raises
+        ------
+        ValueError
+            Hvis callback ikke er lagt til
+        """
+
+        self.__listeners.remove(callback)
+
+
+    def subscribe(self, callback: Callable[[str, object, object], None], key: str|None = None, prefix: str|None = None) -> int:
+        """
+        Metode for å abonnere på endringer i én key, alle keys som starter med et prefix, eller alle keys hvis verken key eller prefix er gitt.
+        Endringer gjort i en .batch blokk samles til én varsling per key med verdien før blokken og siste verdi når den ytterste blokken avsluttes
+
+        Parameters
+        ----------
+        callback : Callable[[str, object, object], None]
+            funksjon som kalles med key, gammel verdi og ny verdi
+
+        key : str|None, optional
+            key det abonneres på
+
+        prefix : str|None, optional
+            prefix til keys det abonneres på, f.eks "audio."
+
+        Returns
+        -------
+        int
+            id som kan gis til .unsubscribe
+
+        Raises
+        ------
+        ValueError
+            Hvis både key og prefix er gitt
+
+        KeyError
+            Hvis objektet er initialisert og ikke har en instilling med gitt key
+
+        Examples
+        --------
+        >>> settings.subscribe(lambda key, old, new: print(key, old, new), key="volume_level")
+        0
+        >>> settings.subscribe(onAudioChange, prefix="audio.")
+        1
+        """
+
+        if key is not None and prefix is not None:
+            raise ValueError("Kan bare abonnere på enten key eller prefix, ikke begge")
+
+        if key is not None and self.__initialized and key not in self.__settings:
+            raise KeyError(f'Settings objektet {self} har ingen instilling med key "{key}"')
+
+        with self.__writeLock:
+            subscribers, target = (self.__keySubscribers, key) if key is not None else (self.__prefixSubscribers, prefix or "")
+            subscribers[target] = subscribers.get(target, []) + [callback] # ny liste, slik at varslinger som pågår ikke ser endringen
+            self.__prefixLengths = tuple(sorted({len(p) for p in self.__prefixSubscribers}))
+
+            subscriptionId = self.__nextSubscriptionId
+            self.__nextSubscriptionId += 1
+            self.__subscriptions[subscriptionId] = (subscribers, target, callback)
+
+        return subscriptionId
+
+
+    def unsubscribe(self, subscriptionId: int) -> None:
+        """
+        Metode for å fjerne et abonnement lagt til med .subscribe
+
+        Parameters
+        ----------
+        subscriptionId : int
+            id returnert av .subscribe
+
+        Raises
+        ------
+        KeyError
+            Hvis det ikke finnes et abonnement med gitt id
+        """
+
+        with self.__writeLock:
+            if subscriptionId not in self.__subscriptions:
+                raise KeyError(f"Finnes ikke noe abonnement med id {subscriptionId}")
+
+            subscribers, target, callback = self.__subscriptions.pop(subscriptionId)
+            callbacks = list(subscribers[target])
+            callbacks.remove(callback)
+            if callbacks:
+                subscribers[target] = callbacks
+            else:
+                del subscribers[target]
+
+            self.__prefixLengths = tuple(sorted({len(p) for p in self.__prefixSubscribers}))
+
+
+    def __publish(self, changes: list[tuple[str, object, object]]) -> None:
+        """
+        Metode for å varsle om endringer, eller samle dem hvis en .batch blokk er aktiv
+
+        Parameters
+        ----------
+        changes : list[tuple[str, object, object]]
+            endringer som (key, gammel verdi, ny verdi)
+        """
+
+        with self.__writeLock:
+            if self.__batchDepth > 0: # samles til én varsling per key når ytterste blokk avsluttes
+                for key, oldValue, newValue in changes:
+                    if key in self.__pendingNotifications:
+                        oldValue = self.__pendingNotifications[key][0] # beholder verdien fra før blokken
+                    self.__pendingNotifications[key] = (oldValue, newValue)
+                return
+
+        for key, oldValue, newValue in changes:
+            self.__notify(key, oldValue, newValue)
+
+
+    def __notify(self, key: str, oldValue: object, newValue: object) -> None:
+        """
+        Metode for å kalle alle listeners og subscribers for en endring
+        """
+
+        for callback in list(self.__listeners):
+            callback(key, oldValue, newValue)
+
+        for callback in self.__keySubscribers.get(key, ()):
+            callback(key, oldValue, newValue)
+
+        prefixSubscribers = self.__prefixSubscribers
+        for length in self.__prefixLengths: # ett oppslag per prefix lengde i stedet for å sjekke hvert prefix
+            for callback in prefixSubscribers.get(key[:length], ()):
+                callback(key, oldValue, newValue)
+
+
+    def setAutoReload(self, interval: float|None) -> None:
+        """
+        Metode for å la .get sjekke om lagringen er endret av andre, f.eks en annen prosess, og hente endringene. 
+        Sjekken er billig (os.stat for json fil), og gjøres maks én gang per interval
+
+        Parameters
+        ----------
+        interval : float|None
+            minste antall sekunder mellom hver sjekk. 0 sjekker ved hver .get, og None skrur av sjekken
+
+        Raises
+        ------
+        ValueError
+            Hvis interval er negativ
+        """
+
+        if interval is not None and interval < 0:
+            raise ValueError(f"interval kan ikke være negativ, fikk {interval}")
+
+        self.__reloadInterval = interval
+        self.__nextReloadCheck = 0.0
+
+
+    def checkForChanges(self) -> bool:
+        """
+        Metode for å sjekke om lagringen er endret av andre siden den sist ble lest, og i så fall hente den på nytt. 
+        Bare instillinger med en annen verdi enn i objektet blir satt, og listeners blir kalt for hver av dem. Kan kalles fra en egen tråd
+
+        Returns
+        -------
+        bool
+            True hvis minst én instilling fikk ny verdi
+
+        Raises
+        ------
+        NotInitializedJSONFileError
+            Hvis objektet ikke har blit initialiser med .initJSONFile eller .initStorage metoden
+        """
+
+        if not self.__initializedStorage: # sjekker om initaliser opp mot json file eller annen lagring
+            raise NotInitializedJSONFileError(f"Settings objektet {self} må være initialisert med .initJSONFile eller .initStorage metode før .checkForChanges metode kan kalles")
+
+        if not self.__storage.changed(): # type: ignore
+            return False
+
+        with self.__writeLock:
+            try:
+                settings = self.__storage.load() # type: ignore
+            except (ValueError, OSError): # filen er halvveis skrevet av en annen prosess eller mangler et øyeblikk, prøver igjen ved neste sjekk
+                return False
+
+            changes: list[tuple[str, object, object]] = []
+            rejected: list[tuple[str, object, str]] = []
+            staging = self.__beginStaging()
+            try:
+                values = self.__currentValues()
+                for key, value in settings.items():
+                    if key not in self.__settings.keys() or value == None or values[key] == value: # bare instillinger som er endret
+                        continue
+
+                    oldValue = values[key]
+                    try:
+                        self.__setValue(key, value)
+                        changes.append((key, oldValue, value))
+
+                    except ValueError: # ved reload hoppes ugyldige verdier alltid over, siden .get ikke skal blokkere eller raise
+                        rejected.append((key, value, "ugyldig verdi"))
+
+            finally:
+                if staging:
+                    self.__commitStaging()
+
+            if rejected:
+                self.__rejectedEntries = rejected
+                print(f"{len(rejected)} ugyldige key-value-pair data fra {self.__storage} ble hoppet over: " + ", ".join(f'"{key}"' for key, _, _ in rejected))
+
+        self.__publish(changes) # kaller listeners etter at alle endringene er satt
+
+        return len(changes) > 0
+
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Context manager for å samle flere .set kall slik at json filen bare skrives én gang når blokken avsluttes.
+        Blokker kan nøstes, og filen skrives når den ytterste blokken avsluttes. Listeners og subscribers får da én varsling per endret key
+
+        Examples
+        --------
+        >>> with settings.batch():
+        ...     for key, value in imported.items():
+        ...         settings.set(key, value)
+        """
+
+        holdLock = self.__concurrent # i concurrent modus holdes låsen hele blokken, slik at .set fra andre tråder venter i stedet for å havne i blokkens kopi, skriving og varslinger
+        if holdLock:
+            self.__writeLock.acquire()
+
+        pending: dict[str, tuple[object, object]] = {}
+        try:
+            with self.__writeLock:
+                self.__batchDepth += 1
+                staging = self.__beginStaging() # i concurrent modus blir alle endringene synlige for andre tråder samtidig når ytterste blokk avsluttes
+
+            try:
+                yield
+
+            finally:
+                with self.__writeLock:
+                    self.__batchDepth -= 1
+                    if staging:
+                        self.__commitStaging()
+
+                    if self.__batchDepth == 0:
+                        if len(self.__changedKeys) > 0: # ytterste blokk er ferdig og det finnes endringer
+                            self.flush()
+
+                        pending, self.__pendingNotifications = self.__pendingNotifications, {}
+
+        finally:
+            if holdLock:
+                self.__writeLock.release()
+
+        for key, (oldValue, newValue) in pending.items(): # én varsling per key, og ingen hvis verdien er tilbake til det den var
+            if oldValue != newValue:
+                self.__notify(key, oldValue, newValue)
+
+
+    def flush(self) -> None:
+        """
+        Metode for å skrive endringer som venter på å bli skrevet til json fil med en gang
+
+        Raises
+        ------
+        NotInitializedJSONFileError
+            Hvis objektet ikke har blit initialiser med .initJSONFile eller .initStorage metoden
+        """
+
+        if not self.__initializedStorage: # sjekker om initaliser opp mot json file eller annen lagring
+            raise NotInitializedJSONFileError(f"Settings objektet {self} må være initialisert med .initJSONFile eller .initStorage metode før .flush metode kan kalles")
+
+        with self.__writeLock:
+            if self.__writeTimer is not None: # avbryter planlagt skriving
+                self.__writeTimer.cancel()
+                self.__writeTimer = None
+
+            if len(self.__changedKeys) > 0:
+                self.__updateStoredSettings(self.__changedKeys)
+                self.__changedKeys = set()
+
+
+    def __persist(self, key: str) -> None:
+        """
+        Metode for å skrive endringer til json fil med en gang, eller utsette skrivingen hvis .batch er aktiv eller writeDelay er satt
+
+        Parameters
+        ----------
+        key : str
+            key til instillingen som er endret
+        """
+
+        with self.__writeLock:
+            if self.__batchDepth > 0: # skrives når .batch blokken avsluttes
+                self.__changedKeys.add(key)
+
+            elif self.__writeDelay is not None: # write-behind, planlegger skriving hvis det ikke allerede er gjort
+                self.__changedKeys.add(key)
+                if self.__writeTimer is None:
+                    self.__writeTimer = threading.Timer(self.__writeDelay, self.flush)
+                    self.__writeTimer.daemon = True
+                    self.__writeTimer.start()
+
+            else:
+                self.__updateStoredSettings({key})
+
+
     def resetStoredSettings(self) -> None:
         """
         Metode for å nullstille json fil med instillingene
@@ -279,74 +1161,137 @@ class Settings:
         Raises
         ------
         NotInitializedJSONFileError
-            Hvis objektet ikke har blit initialiser med .initJSONFile metoden
+            Hvis objektet ikke har blit initialiser med .initJSONFile eller .initStorage metoden
         """
         
-        if not self.__initializedJSONFile: # sjekker om initaliser opp mot json file
-            raise NotInitializedJSONFileError(f"Settings objektet {self} må være initialisert med .initJSONFile metode før .resetStoredSettings metode kan kalles")
+        if not self.__initializedStorage: # sjekker om initaliser opp mot json file eller annen lagring
+            raise NotInitializedJSONFileError(f"Settings objektet {self} må være initialisert med .initJSONFile eller .initStorage metode før .resetStoredSettings metode kan kalles")
 
-        open(self.__json_path, "w").close() # sletter alt innhold i filen
+        self.__storage.reset() # type: ignore sletter alt innhold i filen
 
 
-    def __updateStoredSettings(self) -> None:
+    def __updateStoredSettings(self, changedKeys: Iterable[str]) -> None:
         """
-        Metode for å oppdatere json fil med data fra objektet
+        Metode for å oppdatere json fil eller annen lagring med data fra objektet
+
+        Parameters
+        ----------
+        changedKeys : Iterable[str]
+            keys til instillingene som er endret siden forrige skriving
 
         Raises
         ------
         NotInitializedJSONFileError
-            Hvis objektet ikke har blit initialiser med .initJSONFile metoden
+            Hvis objektet ikke har blit initialiser med .initJSONFile eller .initStorage metoden
         """
 
-        if not self.__initializedJSONFile: # sjekker om initaliser opp mot json file
-            raise NotInitializedJSONFileError(f"Settings objektet {self} må være initialisert med .initJSONFile metode før .__updateStoredSettings metode kan kalles")
+        if not self.__initializedStorage: # sjekker om initaliser opp mot json file eller annen lagring
+            raise NotInitializedJSONFileError(f"Settings objektet {self} må være initialisert med .initJSONFile eller .initStorage metode før .__updateStoredSettings metode kan kalles")
 
         try:
-            with open(self.__json_path, "w") as f: # åpner fil i write modus
-                newDict = dict()  # new dict
-                for key, value in self.__settings.items(): # looper gjennom key-value-pais i settings
-                    newDict[key] = value["value"] # legger til key-value-pair med gitt key og value for gitt value for instillingen
-                
-                json.dump(newDict, f) # konverter dict til json string og legger til i fil
+            started = instrumentation.start()
+            newDict = dict(self.__currentValues())  # kopi av verdiene til alle instillingene
+            changed = {key: newDict[key] for key in changedKeys}
+            self.__storage.save(newDict, changed) # type: ignore
+            if started is not None:
+                instrumentation.record("settings.save", started, keys=len(changed))
 
         except:
-            print(f"Klarte ikke å oppdatere settings til Settings objektet {self} til json fil med path {self.__json_path}")
+            print(f"Klarte ikke å oppdatere settings til Settings objektet {self} til json fil med path {self.__storage}")
             raise 
         
     
     def __getStoredSettings(self) -> None:
         """
-        Metode for å hente settings fra json fil og synce objektet til det
+        Metode for å hente settings fra json fil eller annen lagring og synce objektet til det. Verdiene skrives ikke tilbake til lagringen
 
         Raises
         ------
         NotInitializedJSONFileError
-            Hvis objektet ikke har blit initialiser med .initJSONFile metoden
+            Hvis objektet ikke har blit initialiser med .initJSONFile eller .initStorage metoden
+
+        InvalidStoredSettingsError
+            Hvis lagrede instillinger er ugyldige og LOAD_POLICY er LOAD_POLICY_RAISE
         """
 
-        if not self.__initializedJSONFile: # sjekker om initaliser opp mot json file
-            raise NotInitializedJSONFileError(f"Settings objektet {self} må være initialisert med .initJSONFile metode før .__getStoredSettings metode kan kalles")
+        if not self.__initializedStorage: # sjekker om initaliser opp mot json file eller annen lagring
+            raise NotInitializedJSONFileError(f"Settings objektet {self} må være initialisert med .initJSONFile eller .initStorage metode før .__getStoredSettings metode kan kalles")
 
         try:
-            with open(self.__json_path, "r") as f: # åpner fil
-                json_str  = f.read() # reads content
-                if json_str != "": # så lenge fil ikke er tom
-                    settings: dict[str, str] = json.loads(json_str) # parser json string til dict
-                    for key, value in settings.items(): # looper gjennom hver key-value-pair
+            started = instrumentation.start()
+            settings = self.__storage.load() # type: ignore henter lagrede verdier
+            if started is not None:
+                instrumentation.record("settings.load", started, keys=len(settings))
+
+            rejected: list[tuple[str, object, str]] = []
+            with self.__writeLock:
+                staging = self.__beginStaging() # én kopi for hele innlastingen i concurrent modus
+                try:
+                    for key, value in settings.items(): # looper gjennom hver key-value-pair og samler alle ugyldige før noe håndteres
                         try:
                             if value != None: # så lenge value ikke er None
-                                self.set(key, value) # sett verdi
+                                self.__setValue(key, value) # sett verdi
 
-                        except (KeyError, ValueError) as e: # handle errors
-                            if type(e) == KeyError:
-                                print(f'Ugyldig key ("{key}") for key-value-pair data fra json fil {self.__json_path}')
+                        except KeyError:
+                            rejected.append((key, value, "ugyldig key"))
 
-                            else:
-                                print(f'Ugyldig verdi {value} med key ("{key}") for key-value-pair data fra json fil {self.__json_path}')
+                        except ValueError:
+                            rejected.append((key, value, "ugyldig verdi"))
 
-                            if Input(f"Ønsker du å nullstille filen {self.__json_path} slik at nye settings kan bli lagret på riktig måte (y/n)? ").case({1: ["y"], 2: ["n"]}) == 1:
-                                self.resetStoredSettings()
+                finally:
+                    if staging:
+                        self.__commitStaging()
+
+            self.__rejectedEntries = rejected
+            if rejected:
+                self.__handleRejected(rejected)
+
+        except InvalidStoredSettingsError:
+            raise
 
         except:
-            print(f"Klarte ikke å synce settings til Settings objektet {self} med json fil med path {self.__json_path}")
+            print(f"Klarte ikke å synce settings til Settings objektet {self} med json fil med path {self.__storage}")
             raise
+
+
+    def __handleRejected(self, rejected: list[tuple[str, object, str]]) -> None:
+        """
+        Metode for å håndtere ugyldige lagrede instillinger etter LOAD_POLICY. Kalles en gang med alle ugyldige instillinger
+
+        Parameters
+        ----------
+        rejected : list[tuple[str, object, str]]
+            ugyldige instillinger som (key, verdi, grunn)
+
+        Raises
+        ------
+        InvalidStoredSettingsError
+            Hvis LOAD_POLICY er LOAD_POLICY_RAISE
+        """
+
+        summary = "\n".join(f'  "{key}": {value!r} ({reason})' for key, value, reason in rejected)
+        message = f"{len(rejected)} ugyldige key-value-pair data fra {self.__storage}:\n{summary}"
+
+        policy = self.__LOAD_POLICY
+        if policy == self.LOAD_POLICY_PROMPT and not (sys.stdin and sys.stdin.isatty()): # ingen terminal å spørre, blokkerer ikke
+            policy = self.LOAD_POLICY_SKIP
+
+        if policy == self.LOAD_POLICY_RAISE:
+            raise InvalidStoredSettingsError(message, rejected)
+
+        print(message)
+
+        if policy == self.LOAD_POLICY_DEFAULT: # skriver standardverdien tilbake for keys som finnes
+            with self.__writeLock:
+                with self.batch():
+                    for key, _, _ in rejected:
+                        if key in self.__defaults:
+                            self.__setValue(key, self.__defaults[key])
+                            self.__persist(key)
+
+        elif policy == self.LOAD_POLICY_RESET:
+            self.resetStoredSettings()
+
+        elif policy == self.LOAD_POLICY_PROMPT:
+            if Input(f"Ønsker du å nullstille filen {self.__storage} slik at nye settings kan bli lagret på riktig måte (y/n)? ").case({1: ["y"], 2: ["n"]}) == 1:
+                self.resetStoredSettings()
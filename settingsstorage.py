@@ -0,0 +1,611 @@
+import json, os, tempfile, threading, sqlite3, struct, time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _atomicWrite(path: str, text: str) -> None:
+    """
+    Funksjon for å skrive til fil atomisk. Teksten skrives til en midlertidig fil i samme mappe som så erstatter filen med os.replace,
+    slik at filen aldri blir halvveis skrevet hvis programmet krasjer
+
+    Parameters
+    ----------
+    path : str
+        path til fil som skal skrives
+
+    text : str
+        innholdet i filen
+    """
+
+    fd, tmpPath = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno()) # sørger for at innholdet er på disk før filen erstattes
+
+        os.replace(tmpPath, path)
+
+    except:
+        os.remove(tmpPath)
+        raise
+
+
+def _fileSignature(path: str) -> tuple[int, int]|None:
+    """
+    Funksjon for å hente tidspunkt for siste endring og størrelsen til en fil, som brukes for å se om filen er endret
+
+    Parameters
+    ----------
+    path : str
+        path til fil
+
+    Returns
+    -------
+    tuple[int, int]|None
+        (mtime i nanosekunder, størrelse), eller None hvis filen ikke finnes
+    """
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@contextmanager
+def _lockedAppend(path: str) -> Iterator[BinaryIO]:
+    """
+    Context manager for å åpne en fil for å legge til med eksklusiv lås, slik at bare én prosess skriver til filen om gangen.
+    Hvis filen ble erstattet (f.eks med os.replace) mens vi ventet på låsen, åpnes den nye filen
+
+    Parameters
+    ----------
+    path : str
+        path til fil. Lages hvis den ikke finnes
+    """
+
+    while True:
+        f = open(path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+        except:
+            f.close()
+            raise
+
+        try:
+            if os.path.samestat(os.fstat(f.fileno()), os.stat(path)): # fortsatt samme fil
+                break
+        except FileNotFoundError:
+            pass
+
+        f.close() # lukking slipper låsen
+
+    try:
+        yield f
+
+    finally:
+        f.flush()
+        if fcntl is None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        f.close()
+
+
+class SettingsStorage(ABC):
+    """
+    Baseklasse for hvor et Settings objekt lagrer instillingene sine. Gis til Settings.initStorage
+
+    Methods
+    -------
+    load()
+        Henter lagrede instillinger
+
+    save(settings, changed)
+        Lagrer instillinger
+
+    reset()
+        Sletter lagrede instillinger
+
+    changed()
+        Sjekker om lagringen er endret av noen andre siden forrige load
+    """
+
+    @abstractmethod
+    def load(self) -> dict[str, object]:
+        """
+        Metode for å hente lagrede instillinger
+
+        Returns
+        -------
+        dict[str, object]
+            lagret verdi for hver key
+        """
+
+    @abstractmethod
+    def save(self, settings: dict[str, object], changed: dict[str, object]) -> None:
+        """
+        Metode for å lagre instillinger
+
+        Parameters
+        ----------
+        settings : dict[str, object]
+            verdien til alle instillingene
+
+        changed : dict[str, object]
+            bare instillingene som er endret siden forrige lagring
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """
+        Metode for å slette alle lagrede instillinger
+        """
+
+    def changed(self) -> bool:
+        """
+        Metode for å sjekke om lagringen er endret av andre, f.eks en annen prosess, siden forrige load. 
+        Må være billig nok til å kalles ofte. Lagringer som ikke kan oppdage endringer returnerer alltid False
+
+        Returns
+        -------
+        bool
+            True hvis lagringen bør hentes på nytt med load
+        """
+        return False
+
+
+class JSONStorage(SettingsStorage):
+    """
+    Lagrer instillingene som et json dokument som skrives på nytt ved hver lagring
+    """
+
+    def __init__(self, json_path: str) -> None:
+        """
+        Parameters
+        ----------
+        json_path : str
+            path til json fil
+
+        Raises
+        ------
+        ValueError
+            Hvis fil ikke eksisterer med gitt path eller at fil ikke er en json fil
+        """
+
+        if not os.path.isfile(json_path): # sjekker om det eksisterer en fil med gitt path
+            raise ValueError(f'Det finnes ingen fil med path "{json_path}" fra cwd "{os.getcwd()}"')
+
+        if not json_path.endswith(".json"): # sjekker om fil er av typen json
+            raise ValueError(f'Filen må være json fil, ikke {json_path.split(".")[-1:]} fil')
+
+        self.__json_path = json_path
+        self.__signature: tuple[int, int]|None = None # filens mtime og størrelse ved forrige load eller lagring
+
+    def __str__(self) -> str:
+        return self.__json_path
+
+    def load(self) -> dict[str, object]:
+        signature = _fileSignature(self.__json_path) # hentes før filen leses, så en endring underveis blir oppdaget neste gang
+        with open(self.__json_path, "r") as f: # åpner fil
+            json_str = f.read() # reads content
+            settings = {} if json_str == "" else json.loads(json_str) # parser json string til dict hvis filen ikke er tom
+
+        self.__signature = signature
+        return settings
+
+    def save(self, settings: dict[str, object], changed: dict[str, object]) -> None:
+        with open(self.__json_path, "w") as f: # åpner fil i write modus
+            json.dump(settings, f) # konverter dict til json string og legger til i fil
+
+        self.__signature = _fileSignature(self.__json_path) # egne endringer skal ikke gi reload
+
+    def reset(self) -> None:
+        open(self.__json_path, "w").close() # sletter alt innhold i filen
+        self.__signature = _fileSignature(self.__json_path)
+
+    def changed(self) -> bool:
+        return _fileSignature(self.__json_path) != self.__signature
+
+
+class JournalStorage(SettingsStorage):
+    """
+    Lagrer instillingene som et snapshot i en json fil pluss en logg hvor hver endring legges til som en linje med {"key": value}.
+    En lagring skriver bare de endrede instillingene til slutten av loggen, uansett hvor mange instillinger som finnes.
+    Når loggen har fått compactEvery linjer skrives alle instillingene atomisk til snapshot og loggen tømmes.
+    Skriving låser loggen, mens lesing aldri endrer filene og hopper over en siste linje som ikke er skrevet ferdig
+    """
+
+    def __init__(self, path: str, compactEvery: int = 1000) -> None:
+        """
+        Parameters
+        ----------
+        path : str
+            path til snapshot fil. Loggen lagres i samme mappe med endelsen ".journal". Filene lages hvis de ikke finnes
+
+        compactEvery : int, optional
+            antall linjer i loggen før den slås sammen med snapshot
+
+        Raises
+        ------
+        ValueError
+            Hvis compactEvery er mindre enn 1
+        """
+
+        if compactEvery < 1:
+            raise ValueError(f"compactEvery må være minst 1, ikke {compactEvery}")
+
+        self.__path = path
+        self.__journal_path = path + ".journal"
+        self.__compactEvery = compactEvery
+        self.__records = 0 # antall linjer i loggen
+        self.__signature: tuple[object, object]|None = None # mtime og størrelse til snapshot og logg ved forrige load eller lagring
+
+    def __str__(self) -> str:
+        return self.__path
+
+    def __fileSignatures(self) -> tuple[object, object]:
+        return (_fileSignature(self.__path), _fileSignature(self.__journal_path))
+
+    def load(self) -> dict[str, object]:
+        signature = self.__fileSignatures()
+        settings, self.__records = self.__replay()
+        self.__signature = signature
+        return settings
+
+    def __replay(self) -> tuple[dict[str, object], int]:
+        """
+        Metode for å lese snapshot og spille av loggen. Endrer aldri filene
+
+        Returns
+        -------
+        tuple[dict[str, object], int]
+            lagret verdi for hver key og antall linjer i loggen
+        """
+
+        settings: dict[str, object] = {}
+        if os.path.isfile(self.__path):
+            with open(self.__path, "r") as f:
+                json_str = f.read()
+                if json_str != "":
+                    settings = json.loads(json_str)
+
+        records = 0
+        if os.path.isfile(self.__journal_path):
+            with open(self.__journal_path, "rb") as f:
+                data = f.read()
+
+            end = data.rfind(b"\n") + 1 # siste linje uten linjeskift skrives kanskje fortsatt av en annen prosess, så den hoppes over uten å endre filen
+            for line in data[:end].splitlines(): # spiller av endringene i rekkefølge
+                settings.update(json.loads(line))
+                records += 1
+
+        return settings, records
+
+    def save(self, settings: dict[str, object], changed: dict[str, object]) -> None:
+        if len(changed) == 0:
+            return
+
+        with _lockedAppend(self.__journal_path) as f: # legger til endringene på slutten av loggen, én prosess om gangen
+            size = f.seek(0, os.SEEK_END)
+            if size > 0:
+                f.seek(size - 1)
+                if f.read(1) != b"\n": # siste linje ble ikke skrevet ferdig før et krasj, fjerner den før nye linjer legges til
+                    f.seek(0)
+                    f.truncate(f.read().rfind(b"\n") + 1)
+
+            f.write("".join(json.dumps({key: value}) + "\n" for key, value in changed.items()).encode())
+            f.flush()
+            os.fsync(f.fileno())
+
+            self.__records += len(changed)
+            if self.__records >= self.__compactEvery:
+                self.__compact() # mens loggen er låst, slik at ingen legger til linjer i loggen som erstattes
+
+        self.__signature = self.__fileSignatures() # egne endringer skal ikke gi reload
+
+    def compact(self) -> None:
+        """
+        Metode for å slå sammen snapshot og loggen til et nytt snapshot og tømme loggen.
+        Snapshot skrives før loggen tømmes, så et krasj underveis gir bare at loggen spilles av på nytt
+        """
+
+        with _lockedAppend(self.__journal_path):
+            self.__compact()
+
+        self.__signature = self.__fileSignatures()
+
+    def __compact(self) -> None:
+        """
+        Metode for .compact når loggen allerede er låst. Snapshot lages fra filene og ikke fra verdiene i dette objektet,
+        slik at endringer andre prosesser har lagt til i loggen siden forrige load blir med
+        """
+
+        settings, _ = self.__replay()
+        _atomicWrite(self.__path, json.dumps(settings))
+        _atomicWrite(self.__journal_path, "")
+        self.__records = 0
+
+    def reset(self) -> None:
+        with _lockedAppend(self.__journal_path):
+            _atomicWrite(self.__path, "")
+            _atomicWrite(self.__journal_path, "")
+
+        self.__records = 0
+        self.__signature = self.__fileSignatures()
+
+    def changed(self) -> bool:
+        return self.__fileSignatures() != self.__signature
+
+
+class SQLiteStorage(SettingsStorage):
+    """
+    Lagrer instillingene i en SQLite database med én rad per (namespace, key), slik at mange Settings objekter kan dele samme database.
+    En lagring oppdaterer bare radene som er endret, og alle instillingene for et namespace hentes med én spørring.
+    Databasen bruker WAL modus, og alle SQLiteStorage objekter med samme database deler én tilkobling
+    """
+
+    __connections: dict[str, sqlite3.Connection] = {} # delt tilkobling per database
+    __lock = threading.RLock() # serialiserer bruk av de delte tilkoblingene
+
+    def __init__(self, database: str, namespace: str) -> None:
+        """
+        Parameters
+        ----------
+        database : str
+            path til SQLite database. Lages hvis den ikke finnes
+
+        namespace : str
+            navn som skiller instillingene til dette objektet fra andre i samme database, f.eks en tenant
+
+        Examples
+        --------
+        >>> settings.initStorage(SQLiteStorage("settings.db", namespace = "tenant-42"))
+        """
+
+        self.__database = database
+        self.__namespace = namespace
+        self.__connection = SQLiteStorage.__connect(database)
+        self.__dataVersion: int|None = None # PRAGMA data_version ved forrige load
+
+    def __str__(self) -> str:
+        return f"{self.__database} ({self.__namespace})"
+
+    @staticmethod
+    def __connect(database: str) -> sqlite3.Connection:
+        """
+        Metode for å hente delt tilkobling til databasen, og lage tilkoblingen og tabellen hvis de ikke finnes
+
+        Parameters
+        ----------
+        database : str
+            path til SQLite database
+
+        Returns
+        -------
+        sqlite3.Connection
+            tilkobling til databasen
+        """
+
+        with SQLiteStorage.__lock:
+            connection = SQLiteStorage.__connections.get(database)
+            if connection is None:
+                connection = sqlite3.connect(database, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL") # lesere blokkeres ikke av skriving
+                connection.execute("PRAGMA synchronous=NORMAL") # trygt sammen med WAL, og unngår fsync ved hver commit
+                with connection:
+                    connection.execute("CREATE TABLE IF NOT EXISTS settings (namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (namespace, key)) WITHOUT ROWID")
+
+                SQLiteStorage.__connections[database] = connection
+
+            return connection
+
+    def __getDataVersion(self) -> int:
+        """
+        Metode for å hente PRAGMA data_version, som endres når en annen tilkobling har skrevet til databasen
+        """
+        with SQLiteStorage.__lock:
+            return self.__connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self) -> dict[str, object]:
+        self.__dataVersion = self.__getDataVersion()
+        with SQLiteStorage.__lock:
+            rows = self.__connection.execute("SELECT key, value FROM settings WHERE namespace = ?", (self.__namespace,)).fetchall()
+
+        return {key: json.loads(value) for key, value in rows}
+
+    def save(self, settings: dict[str, object], changed: dict[str, object]) -> None:
+        if len(changed) == 0:
+            return
+
+        with SQLiteStorage.__lock, self.__connection: # én transaksjon for alle endringene
+            self.__connection.executemany("INSERT OR REPLACE INTO settings (namespace, key, value) VALUES (?, ?, ?)", [(self.__namespace, key, json.dumps(value)) for key, value in changed.items()])
+
+    def reset(self) -> None:
+        with SQLiteStorage.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM settings WHERE namespace = ?", (self.__namespace,))
+
+    def changed(self) -> bool:
+        return self.__getDataVersion() != self.__dataVersion # endres bare av andre tilkoblinger, så egne lagringer gir ikke reload
+
+
+class SharedMemoryStorage(SettingsStorage):
+    """
+    Publiserer instillingene i et multiprocessing.shared_memory segment med en versjonsteller, slik at mange prosesser kan lese dem uten å lese og parse en fil.
+    Én prosess lager segmentet med create = True og en underliggende lagring, f.eks JSONStorage, som instillingene hentes fra og skrives til.
+    De andre prosessene kobler seg til segmentet med samme navn, og oppdager endringer ved å sammenligne versjonstelleren med Settings.setAutoReload.
+    Bare én prosess bør endre instillingene om gangen
+
+    Segmentet består av en header med versjon og lengde (to uint64) etterfulgt av instillingene som json. 
+    Versjonen er oddetall mens segmentet skrives, slik at lesere kan oppdage og prøve igjen hvis de leser midt i en skriving
+    """
+
+    __HEADER = struct.Struct("QQ") # versjon, lengde på json
+    __VERSION = struct.Struct("Q")
+
+    def __init__(self, name: str, storage: SettingsStorage|None = None, create: bool = False, size: int = 1 << 20, readTimeout: float = 1.0) -> None:
+        """
+        Parameters
+        ----------
+        name : str
+            navnet til shared memory segmentet
+
+        storage : SettingsStorage|None, optional
+            lagringen som instillingene hentes fra og skrives til, i prosessen som publiserer
+
+        create : bool, optional
+            om segmentet skal lages. Gjøres av prosessen som publiserer, før de andre prosessene starter
+
+        size : int, optional
+            størrelsen på segmentet i bytes hvis det lages
+
+        readTimeout : float, optional
+            maks antall sekunder en lesing venter på at en skriving blir ferdig, f.eks hvis prosessen som publiserer døde midt i en skriving
+
+        Raises
+        ------
+        ValueError
+            Hvis readTimeout ikke er positiv
+
+        Examples
+        --------
+        >>> # master prosess
+        >>> settings.initStorage(SharedMemoryStorage("app-settings", JSONStorage("settings.json"), create = True))
+        >>> # worker prosess
+        >>> settings.initStorage(SharedMemoryStorage("app-settings"))
+        >>> settings.setAutoReload(0)
+        """
+
+        if readTimeout <= 0:
+            raise ValueError(f"readTimeout må være positiv, fikk {readTimeout}")
+
+        self.__name = name
+        self.__storage = storage
+        self.__created = create
+        self.__readTimeout = readTimeout
+        if create:
+            self.__memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self.__HEADER.pack_into(self.__memory.buf, 0, 0, 0)
+
+        else:
+            try:
+                self.__memory = shared_memory.SharedMemory(name=name, track=False) # type: ignore python 3.13+, segmentet skal ikke slettes når denne prosessen avsluttes
+            except TypeError:
+                self.__memory = shared_memory.SharedMemory(name=name)
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self.__memory._name, "shared_memory") # type: ignore
+
+        self.__version: int|None = None # versjonen som ble lest eller skrevet sist
+
+    def __str__(self) -> str:
+        return f"shared memory {self.__name}" if self.__storage is None else str(self.__storage)
+
+    def __read(self) -> tuple[int, dict[str, object]]:
+        """
+        Metode for å lese instillingene fra segmentet. Prøver igjen til lesingen ikke overlapper med en skriving, 
+        med økende pause mellom forsøkene, og gir opp etter readTimeout sekunder
+
+        Returns
+        -------
+        tuple[int, dict[str, object]]
+            versjonen og instillingene
+
+        Raises
+        ------
+        TimeoutError
+            Hvis segmentet fortsatt skrives etter readTimeout sekunder, f.eks fordi prosessen som publiserer døde midt i en skriving
+        """
+
+        buf = self.__memory.buf
+        deadline = time.monotonic() + self.__readTimeout
+        delay = 0.0
+        while True:
+            version, length = self.__HEADER.unpack_from(buf, 0)
+            if version % 2 == 0: # ingen skriving pågår
+                payload = bytes(buf[self.__HEADER.size:self.__HEADER.size + length])
+                if self.__VERSION.unpack_from(buf, 0)[0] == version: # ingen skriving startet mens vi leste
+                    return version, (json.loads(payload) if length > 0 else {})
+
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Shared memory segmentet {self.__name} har vært under skriving i mer enn {self.__readTimeout} sekunder. Prosessen som publiserer kan ha stoppet midt i en skriving")
+
+            time.sleep(delay) # første forsøk på nytt uten pause, deretter økende pause opp til 10 ms
+            delay = min(max(delay * 2, 0.00005), 0.01)
+
+    def __publish(self, settings: dict[str, object]) -> None:
+        """
+        Metode for å skrive instillingene til segmentet og øke versjonen
+
+        Parameters
+        ----------
+        settings : dict[str, object]
+            verdien til alle instillingene
+
+        Raises
+        ------
+        ValueError
+            Hvis instillingene ikke får plass i segmentet
+        """
+
+        payload = json.dumps(settings).encode()
+        buf = self.__memory.buf
+        if self.__HEADER.size + len(payload) > len(buf):
+            raise ValueError(f"Instillingene ({len(payload)} bytes) får ikke plass i shared memory segmentet {self.__name} på {len(buf)} bytes")
+
+        version = self.__VERSION.unpack_from(buf, 0)[0]
+        self.__VERSION.pack_into(buf, 0, version + 1) # oddetall, lesere venter
+        buf[self.__HEADER.size:self.__HEADER.size + len(payload)] = payload
+        self.__HEADER.pack_into(buf, 0, version + 1, len(payload))
+        self.__VERSION.pack_into(buf, 0, version + 2) # partall, ferdig skrevet
+        self.__version = version + 2
+
+    def load(self) -> dict[str, object]:
+        if self.__storage is not None: # prosessen som publiserer henter fra underliggende lagring
+            settings = self.__storage.load()
+            self.__publish(settings)
+            return settings
+
+        self.__version, settings = self.__read()
+        return settings
+
+    def save(self, settings: dict[str, object], changed: dict[str, object]) -> None:
+        if self.__storage is not None:
+            self.__storage.save(settings, changed)
+
+        self.__publish(settings)
+
+    def reset(self) -> None:
+        if self.__storage is not None:
+            self.__storage.reset()
+
+        self.__publish({})
+
+    def changed(self) -> bool:
+        if self.__storage is not None and self.__storage.changed(): # underliggende lagring er endret av andre
+            return True
+
+        version = self.__VERSION.unpack_from(self.__memory.buf, 0)[0]
+        return version % 2 == 0 and version != self.__version
+
+    def close(self) -> None:
+        """
+        Metode for å koble fra segmentet. Segmentet slettes hvis det ble laget av dette objektet
+        """
+
+        self.__memory.close()
+        if self.__created:
+            self.__memory.unlink()
@@ -1,6 +1,85 @@
+from pylibs.displaywidth import displayWidth, ljust
+from pylibs.csvreader import CSVReader
+from pylibs import instrumentation
+
+
+class _RowView:
+    """
+    Klasse for å vise et utvalg av kolonnene i en rad uten å kopiere raden
+    """
+
+    def __init__(self, row: list[str], columns: list[int]) -> None:
+        self.__row = row
+        self.__columns = columns
+
+    def __len__(self) -> int:
+        return len(self.__columns)
+
+    def __getitem__(self, index: int) -> str:
+        return self.__row[self.__columns[index]]
+
+    def __iter__(self):
+        for cindex in self.__columns:
+            yield self.__row[cindex]
+
+
+class _DatasetView:
+    """
+    Klasse for å vise et utvalg av rader og kolonner i et datasett uten å kopiere det. Bare lesing er støttet
+    """
+
+    def __init__(self, rows: list[list[str]], rowRange: range, columns: list[int]|None) -> None:
+        """
+        Parameters
+        ----------
+        rows : list[list[str]]
+            datasettet som deles
+
+        rowRange : range
+            indeksene til radene som er med i utvalget
+
+        columns : list[int]|None
+            indeksene til kolonnene som er med i utvalget, None for alle
+        """
+        self.__rows = rows
+        self.__rowRange = rowRange
+        self.__columns = columns
+
+    def __len__(self) -> int:
+        return len(self.__rowRange)
+
+    def __getitem__(self, index: int|slice) -> "list[str]|_RowView|_DatasetView":
+        if isinstance(index, slice): # slicing gir en ny view, ikke en kopi
+            return _DatasetView(self.__rows, self.__rowRange[index], self.__columns)
+
+        row = self.__rows[self.__rowRange[index]]
+        return row if self.__columns is None else _RowView(row, self.__columns)
+
+    def __iter__(self):
+        for index in range(len(self.__rowRange)):
+            yield self[index]
+
+
 class Table:
     """
     Klasse for å representere en tabell som kan printes ut i python
+
+    Methods
+    -------
+    append_row(row)
+        Legg til en rad på slutten av tabellen
+
+    extend(rows)
+        Legg til flere rader på slutten av tabellen
+
+    render_new()
+        Returnerer bare linjene for rader som er lagt til siden forrige rendering
+
+    render_window(start, count, header)
+        Returnerer et utsnitt av radene med samme kolonnebredder som hele tabellen
+
+    from_csvreader(reader, columns, rows)
+        Lager en tabell som viser data fra et CSVReader objekt uten å kopiere det
     """
 
     def __init__(self, columnNames: list[str], dataset: list[list[str]], padding: int = 5, divider: bool = False, frame: bool = False) -> None: 
@@ -44,37 +123,142 @@ class Table:
         └────────────────────────────────────┘  
         """
 
+        self.__setup(columnNames, dataset, padding, divider, frame)
+    
+        for data in self.__dataset: # looper gjennom dataset altså hver rad, og sjekker om antallet verdier i listen, altså kolonner, samsvarer med antallet kolonnenavn
+            if(len(data) != len(self.__columnNames)):
+                raise IndexError("Antall kolonner stemmer ikke med lengden av dataset")
+
+    def __setup(self, columnNames: list[str], dataset: list[list[str]], padding: int, divider: bool, frame: bool) -> None:
+        """
+        Metode for å sette attributtene til objektet uten å validere dataset
+        """
+
         self.__columnNames = columnNames 
         self.__dataset = dataset
         self.__padding = padding
         self.__frame = frame
         self.__divider = divider
         self.__string = ""
-    
-        for data in self.__dataset: # looper gjennom dataset altså hver rad, og sjekker om antallet verdier i listen, altså kolonner, samsvarer med antallet kolonnenavn
-            if(len(data) != len(self.__columnNames)):
-                raise IndexError("Antall kolonner stemmer ikke med lengden av dataset")
+        self.__columnLengths: list[int]|None = None # cache med bredden til hver kolonne, beregnes første gang den trengs
+        self.__measuredRows = 0 # antall rader i dataset som er med i cachen, rader lagt til direkte i dataset etterpå måles ved neste bruk
+        self.__renderedLengths: list[int]|None = None # kolonnebreddene som ble brukt sist hele tabellen ble rendret
+        self.__renderedRows = 0 # antall rader i dataset som er rendret
+
+    @classmethod
+    def from_csvreader(cls, reader: CSVReader, columns: list[int]|None = None, rows: slice|None = None, padding: int = 5, divider: bool = False, frame: bool = False) -> "Table":
+        """
+        Lag en tabell som viser dataen i et CSVReader objekt. Datasettet deles med readeren i stedet for å kopieres, 
+        og valideringen og de cachede kolonnebreddene til readeren brukes i stedet for å gå gjennom alle radene på nytt.
+        Tabellen er en view, så rader kan ikke legges til med append_row eller extend
+
+        Parameters
+        ----------
+        reader : CSVReader
+            CSVReader objekt med minst én header, hvor første header blir brukt som kolonnenavn
+
+        columns : list[int]|None, optional
+            indeksene til kolonnene som skal vises, i gitt rekkefølge. Alle kolonner hvis None
+
+        rows : slice|None, optional
+            hvilke rader som skal vises. Alle rader hvis None
+
+        padding : int, optional
+            Antall mellomrom mellom hver kolonne
+
+        divider : bool, optional
+            Om raddeler skal være med
+
+        frame : bool, optional
+            Om ramme skal være med
+
+        Returns
+        -------
+        Table
+            tabell som viser utvalget av readeren
+
+        Raises
+        ------
+        ValueError
+            Hvis readeren ikke har noen headers
+
+        IndexError
+            Hvis en av indeksene i columns er ute av range
+
+        InvalidDataStructure
+            Hvis datastrukturen til readeren ikke er gyldig
+
+        Examples
+        --------
+        >>> reader = CSVReader("data.csv")
+        >>> reader.read(header = 1)
+        >>> print(Table.from_csvreader(reader, columns = [0, 2], rows = slice(0, 40), frame = True))
+        """
+
+        if len(reader.headers) == 0:
+            raise ValueError("CSVReader objektet må ha minst én header som kan brukes som kolonnenavn")
+
+        if not reader.is_validated: # validerer bare hvis readeren ikke allerede er validert
+            reader.validate_data()
+
+        header = reader.headers[0]
+        readerLengths = reader.get_column_lengths() # cachet i readeren
+        if columns is None:
+            columnNames = header
+            columnLengths = readerLengths
+        else:
+            for cindex in columns:
+                if not -len(header) <= cindex < len(header):
+                    raise IndexError(f"Kolonne med index {cindex} finnes ikke. Readeren har {len(header)} kolonne(r)")
+
+            columnNames = [header[cindex] for cindex in columns]
+            columnLengths = [readerLengths[cindex] for cindex in columns]
+
+        rowRange = range(len(reader.data_set))
+        if rows is not None:
+            rowRange = rowRange[rows]
+
+        table = cls.__new__(cls)
+        table.__setup(columnNames, _DatasetView(reader.data_set, rowRange, columns), padding, divider, frame) # type: ignore
+        table.__columnLengths = columnLengths
+        table.__measuredRows = len(rowRange)
+        return table
 
     def __getColumnLengths(self) -> list[int]:
         """
-        Metode for å kalkulere lengste string i hver kolonne
+        Metode for å kalkulere lengste string i hver kolonne. Resultatet caches og holdes oppdatert av append_row og extend.
+        Rader som er lagt til direkte i dataset siden forrige måling måles i tillegg, og hvis rader er fjernet måles alt på nytt
 
         Returns
         -------
         list[int]
             Liste med tallene for lengste string i hver kolonne
         """
+        if self.__columnLengths is not None and self.__measuredRows <= len(self.__dataset): # bruker cachet kolonnebredde hvis den finnes
+            columnLengths = self.__columnLengths
+            for row in self.__dataset[self.__measuredRows:]: # rader lagt til utenom append_row og extend
+                for cindex, data in enumerate(row):
+                    width = displayWidth(data)
+                    if width > columnLengths[cindex]:
+                        columnLengths[cindex] = width
+
+            self.__measuredRows = len(self.__dataset)
+            return columnLengths
+
         cindex = 0 # kolonne index
         columnLengths: list[int] = [] # liste med lengden på lengste tekst hver kolonne
         while cindex < len(self.__columnNames): # looper gjennom hver kolonne
-            columnLength = len(self.__columnNames[cindex]) # setter kolonnelengde til lengden av navnet på kolonnen
+            columnLength = displayWidth(self.__columnNames[cindex]) # setter kolonnelengde til lengden av navnet på kolonnen
             for data in self.__dataset: # looper gjennom hver rad
-                if len(data[cindex]) > columnLength: # sjekker om lengden av teksten i neste rad i kolonnen er størst
-                    columnLength = len(data[cindex]) # setter lengden av kolonnen til den lengste tesktene i kolonnen
+                width = displayWidth(data[cindex]) # visningsbredden til teksten
+                if width > columnLength: # sjekker om lengden av teksten i neste rad i kolonnen er størst
+                    columnLength = width # setter lengden av kolonnen til den lengste tesktene i kolonnen
             
             columnLengths.append(columnLength) # legger til lengden av gitt kolonne til liste med lengder av alle kolonnene
             cindex+=1 # legger til 1 slik at lengden av neste kolonne beregnes
 
+        self.__columnLengths = columnLengths
+        self.__measuredRows = len(self.__dataset)
         return columnLengths 
 
     def __hoizontalFrame(self, columnLengths: list[int], isTop: bool) -> None:
@@ -153,9 +337,9 @@ class Table:
         
         for cindex in range(len(row)): # looper gjennom hver kolonne index i raden
             if cindex < len(row) - 1: # alle kolonner bortsett fra siste
-                self.__string += row[cindex].ljust(columnLengths[cindex] + self.__padding) # juster teksten slik at den tar opp hele kolonnen og legg til padding mellom hver kolonne
+                self.__string += ljust(row[cindex], columnLengths[cindex] + self.__padding) # juster teksten slik at den tar opp hele kolonnen og legg til padding mellom hver kolonne
             else: # siste kolonne
-                self.__string += row[cindex].ljust(columnLengths[cindex]) # juster teksten slik at den tar opp hele kolonnen men ikke legg til padding
+                self.__string += ljust(row[cindex], columnLengths[cindex]) # juster teksten slik at den tar opp hele kolonnen men ikke legg til padding
 
         if self.__frame:
             self.__string += " │ \n"
@@ -168,20 +352,216 @@ class Table:
                 self.__rowDivider(columnLengths, sepSymbol) # hvis divider er satt til True og sepSymbol er gitt, legg til raddeler
 
     
-    def __str__(self) -> str: 
+    def __render(self, rows: list[list[str]], columnLengths: list[int], header: bool = True) -> str:
         """
-        Returnerer string representasjonen av objektet
+        Metode for å rendre gitte rader med gitte kolonnebredder
+
+        Parameters
+        ----------
+        rows : list[list[str]]
+            Radene som skal rendres
+
+        columnLengths : list[int]
+            Liste med bredden til hver kolonne
+
+        header : bool, optional
+            Om raden med kolonnenavn skal være med
+
+        Returns
+        -------
+        str
+            string representasjonen av radene
         """
- 
-        columnLengths = self.__getColumnLengths() # Liste med kalkulert lengden på lengste string i hver kolonne
-        
+
+        self.__string = "" # nullstiller string slik at tabellen ikke legges til flere ganger ved flere kall
+
         if self.__frame: # hvis frame skal være med
             self.__hoizontalFrame(columnLengths, True) # legg til hosisontal frame for toppen
 
-        self.__addRow(self.__columnNames, columnLengths, False, "═") # legger til raden med kolonnenavn
-        [self.__addRow(row, columnLengths, True) if index == len(self.__dataset) - 1 else self.__addRow(row, columnLengths, False, "─") for index, row in enumerate(self.__dataset)] # looper gjennom hver rad i dataset og legger til
+        if header:
+            self.__addRow(self.__columnNames, columnLengths, False, "═") # legger til raden med kolonnenavn
+        [self.__addRow(row, columnLengths, True) if index == len(rows) - 1 else self.__addRow(row, columnLengths, False, "─") for index, row in enumerate(rows)] # looper gjennom hver rad og legger til
 
         if self.__frame: # hvis frame skal være med
             self.__hoizontalFrame(columnLengths, False) # legg til hosisontal frame for bunnen
 
-        return self.__string # returner string representasjonen for objektet
\ No newline at end of file
+        return self.__string
+
+    def __str__(self) -> str: 
+        """
+        Returnerer string representasjonen av objektet
+        """
+ 
+        started = instrumentation.start()
+        if not isinstance(self.__dataset, _DatasetView): # dataset deles med kalleren og kan være endret direkte, så hele tabellen måles på nytt som før
+            self.__columnLengths = None
+
+        columnLengths = self.__getColumnLengths() # Liste med kalkulert lengden på lengste string i hver kolonne
+        string = self.__render(self.__dataset, columnLengths)
+
+        self.__renderedLengths = list(columnLengths) # husker hvilke kolonnebredder som er rendret
+        self.__renderedRows = len(self.__dataset)
+        if started is not None:
+            instrumentation.record("table.str", started, rows=len(self.__dataset), chars=len(string))
+
+        return string # returner string representasjonen for objektet
+
+    def __len__(self) -> int:
+        """
+        Returnerer antall rader i tabellen
+        """
+        return len(self.__dataset)
+
+    def render_window(self, start: int, count: int, header: bool = True) -> str:
+        """
+        Metode for å rendre bare et utsnitt av radene, f.eks for å vise en del av en veldig stor tabell.
+        Kolonnebreddene er de samme som for hele tabellen, slik at utsnittet står på linje med resten av tabellen
+
+        Parameters
+        ----------
+        start : int
+            Index til første rad i utsnittet
+
+        count : int
+            Maks antall rader i utsnittet
+
+        header : bool, optional
+            Om raden med kolonnenavn skal være med øverst i utsnittet
+
+        Returns
+        -------
+        str
+            string representasjonen av utsnittet, med frame og raddelere som for en hel tabell
+
+        Raises
+        ------
+        ValueError
+            Hvis start eller count er negativ
+
+        Examples
+        --------
+        >>> table = Table(["Kolonne1", "Kolonne2"], [[str(i), str(i * 2)] for i in range(1000000)], frame = True)
+        >>> print(table.render_window(500, 40)) # viser rad 500 til 539
+        """
+
+        if start < 0 or count < 0:
+            raise ValueError(f"start og count kan ikke være negative, fikk start={start} og count={count}")
+
+        columnLengths = self.__getColumnLengths() # globale kolonnebredder, beregnes bare første gang
+        return self.__render(self.__dataset[start:start + count], columnLengths, header) # slicer bare radene som vises
+
+    def append_row(self, row: list[str]) -> bool:
+        """
+        Metode for å legge til en rad på slutten av tabellen uten å validere eller måle resten av tabellen på nytt
+
+        Parameters
+        ----------
+        row : list[str]
+            Data for raden som skal legges til
+
+        Returns
+        -------
+        bool
+            True hvis kolonnebreddene har endret seg siden forrige rendering, og hele tabellen må tegnes på nytt
+
+        Raises
+        ------
+        IndexError
+            Hvis antall verdier i raden ikke stemmer med antall kolonner
+
+        TypeError
+            Hvis tabellen er laget med from_csvreader
+
+        Examples
+        --------
+        >>> table = Table(["Kolonne1", "Kolonne2"], [["10", "20"]])
+        >>> print(table)
+        >>> if table.append_row(["30", "40"]):
+        ...     print(table) # kolonnene ble bredere, tegn hele tabellen på nytt
+        ... else:
+        ...     print(table.render_new()) # print bare den nye raden
+        """
+
+        return self.extend([row])
+
+    def extend(self, rows: list[list[str]]) -> bool:
+        """
+        Metode for å legge til flere rader på slutten av tabellen. Kostnaden avhenger bare av antall nye rader
+
+        Parameters
+        ----------
+        rows : list[list[str]]
+            2d liste med radene som skal legges til
+
+        Returns
+        -------
+        bool
+            True hvis kolonnebreddene har endret seg siden forrige rendering, og hele tabellen må tegnes på nytt
+
+        Raises
+        ------
+        IndexError
+            Hvis antall verdier i en av radene ikke stemmer med antall kolonner. Ingen rader blir lagt til
+
+        TypeError
+            Hvis tabellen er laget med from_csvreader
+        """
+
+        if isinstance(self.__dataset, _DatasetView):
+            raise TypeError("Kan ikke legge til rader i en tabell som viser data fra et CSVReader objekt")
+
+        for row in rows: # validerer alle radene før noen legges til
+            if len(row) != len(self.__columnNames):
+                raise IndexError("Antall kolonner stemmer ikke med lengden av raden som skal legges til")
+
+        columnLengths = self.__getColumnLengths() # henter kolonnebredder før radene legges til slik at de ikke måles to ganger
+        for row in rows:
+            self.__dataset.append(row)
+            for cindex, data in enumerate(row): # utvider kolonnebredden hvis den nye verdien er lengre
+                width = displayWidth(data)
+                if width > columnLengths[cindex]:
+                    columnLengths[cindex] = width
+
+        self.__measuredRows = len(self.__dataset)
+
+        return columnLengths != self.__renderedLengths
+
+    def render_new(self) -> str:
+        """
+        Returnerer string for radene som er lagt til siden forrige rendering, slik at de kan skrives rett etter forrige output.
+        Med frame inneholder stringen også en ny bunnramme, og skal skrives over den forrige bunnrammen (flytt markøren én linje opp først).
+        Hvis kolonnebreddene har endret seg siden forrige rendering returneres hele tabellen
+
+        Returns
+        -------
+        str
+            De nye linjene, eller hele tabellen hvis den må tegnes på nytt
+        """
+
+        columnLengths = self.__getColumnLengths()
+        if columnLengths != self.__renderedLengths: # kolonnene har endret bredde, så hele tabellen må tegnes på nytt
+            return str(self)
+
+        rows = self.__dataset[self.__renderedRows:] # bare radene som ikke er rendret
+        if len(rows) == 0:
+            return ""
+
+        self.__string = ""
+        if self.__renderedRows > 0: # forrige output sluttet med en datarad uten raddeler
+            if not self.__frame:
+                self.__string += "\n"
+
+            if self.__divider:
+                self.__rowDivider(columnLengths, "─")
+
+        for index, row in enumerate(rows):
+            if index == len(rows) - 1:
+                self.__addRow(row, columnLengths, True)
+            else:
+                self.__addRow(row, columnLengths, False, "─")
+
+        if self.__frame:
+            self.__hoizontalFrame(columnLengths, False)
+
+        self.__renderedRows = len(self.__dataset)
+        return self.__string
\ No newline at end of file
@@ -1,17 +1,531 @@
+import sys, queue, array, asyncio, threading, concurrent.futures
+from abc import ABC, abstractmethod
+from collections import deque, Counter
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterable, Iterator, TextIO
+
+try:
+    import numpy # valgfri, brukes bare av asNumpy i Input.intArray og Input.floatArray
+except ImportError:
+    numpy = None
+
+
 class ExitInputState(Exception):
     pass
 
 class ExitProgram(Exception):
     pass
 
+class NumberParseError(ValueError):
+    """
+    Exception som blir raised når et tall i en linje ikke kan konverteres. line, field og column er 1-indeksert
+    """
+
+    def __init__(self, message: str, line: int, field: int, column: int) -> None:
+        super().__init__(message)
+        self.line = line
+        self.field = field
+        self.column = column
+
+
+class NoCaseMatchError(ValueError):
+    """
+    Exception som blir raised når input ikke matcher noen case. suggestions er en liste med (case, verdi, likhet) for de nærmeste verdiene hvis CaseMatcher har fuzzy=True
+    """
+
+    def __init__(self, message: str, suggestions: list[tuple[int|str, str, float]]|None = None) -> None:
+        super().__init__(message)
+        self.suggestions = suggestions or []
+
+
+class InputSource(ABC):
+    """
+    Base klasse for hvor Input leser fra. Subklasser implementerer .readline, og kan implementere .areadline hvis kilden kan leses uten en egen tråd
+    """
+
+    __pendingRead: concurrent.futures.Future|None = None # lesing som fortsatt pågår i en tråd etter at en async prompt ble avbrutt
+
+    @abstractmethod
+    def readline(self, prompt: str) -> str:
+        """
+        Metode for å lese én linje
+
+        Parameters
+        ----------
+        prompt : str
+            tekst som skrives før input, hvis kilden viser den
+
+        Returns
+        -------
+        str
+            linjen uten linjeskift
+
+        Raises
+        ------
+        EOFError
+            Hvis kilden er tom
+        """
+
+
+    async def areadline(self, prompt: str) -> str:
+        """
+        Metode for å lese én linje uten å blokkere event loop. Standard er å kalle .readline i en daemon tråd.
+        Hvis ventingen avbrytes, f.eks av timeout, fortsetter lesingen, og linjen gis til neste kall i stedet for å gå tapt
+
+        Parameters
+        ----------
+        prompt : str
+            tekst som skrives før input, hvis kilden viser den
+
+        Returns
+        -------
+        str
+            linjen uten linjeskift
+
+        Raises
+        ------
+        EOFError
+            Hvis kilden er tom
+        """
+
+        if self.__pendingRead is None: # starter ny lesing bare hvis ingen pågår fra før
+            future: concurrent.futures.Future = concurrent.futures.Future()
+
+            def read() -> None:
+                try:
+                    future.set_result(self.readline(prompt))
+                except BaseException as e:
+                    future.set_exception(e)
+
+            self.__pendingRead = future
+            threading.Thread(target=read, daemon=True).start() # daemon, slik at programmet kan avslutte mens input() venter
+
+        future = self.__pendingRead
+        try:
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        finally:
+            if future.done(): # ferdig, både med linje og med feil. Bare en lesing som fortsatt pågår etter avbrudd beholdes til neste kall
+                self.__pendingRead = None
+
+
+class ConsoleSource(InputSource):
+    """
+    Leser fra konsoll med builtin input, som er standard
+    """
+
+    def readline(self, prompt: str) -> str:
+        return input(prompt)
+
+
+    async def areadline(self, prompt: str) -> str:
+        """
+        Venter på stdin med event loop når stdin er en terminal, slik at ingenting leses hvis ventingen avbrytes. Ellers brukes en tråd
+        """
+
+        loop = asyncio.get_running_loop()
+        try:
+            if not sys.stdin.isatty():
+                raise ValueError
+            fd = sys.stdin.fileno()
+
+        except (AttributeError, ValueError, OSError): # ikke en terminal, eller stdin er byttet ut
+            return await super().areadline(prompt)
+
+        ready = loop.create_future()
+        try:
+            loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+
+        except NotImplementedError: # event loop uten add_reader, f.eks på Windows
+            return await super().areadline(prompt)
+
+        try:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+            await ready
+
+        finally:
+            loop.remove_reader(fd)
+
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError("stdin er lukket")
+
+        return line[:-1] if line.endswith("\n") else line
+
+
+class IteratorSource(InputSource):
+    """
+    Leser ferdige svar fra en iterable, f.eks en liste eller generator
+
+    Examples
+    --------
+    >>> Init.setSource(IteratorSource(["1", "pizza", "q"]))
+    """
+
+    def __init__(self, lines: Iterable[str], echo: bool = False) -> None:
+        """
+        Initialiser IteratorSource
+
+        Parameters
+        ----------
+        lines : Iterable[str]
+            svarene som skal leses, ett per Input
+
+        echo : bool, optional
+            om prompt og svar skal skrives til konsoll
+        """
+
+        self.__lines: Iterator[str] = iter(lines)
+        self.__echo = echo
+
+
+    async def areadline(self, prompt: str) -> str:
+        return self.readline(prompt) # blokkerer ikke, trenger ingen tråd
+
+
+    def readline(self, prompt: str) -> str:
+        try:
+            line = next(self.__lines)
+
+        except StopIteration:
+            raise EOFError("Ingen flere linjer i IteratorSource") from None
+
+        if self.__echo:
+            print(prompt + line)
+
+        return line
+
+
+class StreamSource(InputSource):
+    """
+    Leser linjer fra en fil eller stream, f.eks sys.stdin, i store blokker i stedet for ett kall per linje
+    """
+
+    def __init__(self, stream: TextIO|None = None, echo: bool = False, chunkSize: int = 1 << 16) -> None:
+        """
+        Initialiser StreamSource
+
+        Parameters
+        ----------
+        stream : TextIO|None, optional
+            stream det leses fra, sys.stdin hvis None
+
+        echo : bool, optional
+            om prompt og svar skal skrives til konsoll
+
+        chunkSize : int, optional
+            omtrent antall tegn som leses om gangen
+
+        Raises
+        ------
+        ValueError
+            Hvis chunkSize ikke er positiv
+        """
+
+        if chunkSize <= 0:
+            raise ValueError(f"chunkSize må være positiv, fikk {chunkSize}")
+
+        self.__stream = stream if stream is not None else sys.stdin
+        self.__echo = echo
+        self.__chunkSize = chunkSize
+        self.__buffer: deque[str] = deque()
+
+
+    def readline(self, prompt: str) -> str:
+        if not self.__buffer:
+            self.__buffer.extend(self.__stream.readlines(self.__chunkSize)) # leser mange linjer i ett kall
+            if not self.__buffer:
+                raise EOFError(f"Ingen flere linjer i {self.__stream}")
+
+        line = self.__buffer.popleft()
+        line = line[:-1] if line.endswith("\n") else line
+        if self.__echo:
+            print(prompt + line)
+
+        return line
+
+
+class QueueSource(InputSource):
+    """
+    Leser linjer fra en queue.Queue, f.eks fylt av en annen tråd. None i køen betyr at det ikke kommer flere linjer
+    """
+
+    def __init__(self, lineQueue: queue.Queue, echo: bool = False, timeout: float|None = None) -> None:
+        """
+        Initialiser QueueSource
+
+        Parameters
+        ----------
+        lineQueue : queue.Queue
+            kø med linjer
+
+        echo : bool, optional
+            om prompt og svar skal skrives til konsoll
+
+        timeout : float|None, optional
+            maks antall sekunder det ventes på en linje, None for å vente uten grense
+        """
+
+        self.__queue = lineQueue
+        self.__echo = echo
+        self.__timeout = timeout
+
+
+    def readline(self, prompt: str) -> str:
+        try:
+            line = self.__queue.get(timeout=self.__timeout)
+
+        except queue.Empty:
+            raise TimeoutError(f"Fikk ingen linje fra køen innen {self.__timeout} sekunder") from None
+
+        if line is None: # sentinel for slutt
+            raise EOFError("QueueSource er avsluttet")
+
+        if self.__echo:
+            print(prompt + line)
+
+        return line
+
+
+class CommandRegistry:
+    """
+    Klasse for kommandoer som raiser gitt exception ved input. Eksakte kommandoer slås opp i en dict, og forkortelser i et trie.
+    Et registry kan ha en parent, slik at f.eks kommandoer for en meny legges oppå de globale kommandoene og overstyrer dem
+
+    Examples
+    --------
+    >>> commands = CommandRegistry({"quit": ExitProgram, "back": ExitInputState}, prefixMatching=True)
+    >>> commands.resolve("qu") is ExitProgram
+    True
+    >>> menu = commands.child({"quiet": ExitInputState})
+    >>> menu.resolve("qu") # tvetydig, "quit" eller "quiet"
+    """
+
+    def __init__(self, commands: dict[str, type[Exception]]|None = None, parent: "CommandRegistry|None" = None, prefixMatching: bool = False, minPrefixLength: int = 1) -> None:
+        """
+        Initialiser CommandRegistry
+
+        Parameters
+        ----------
+        commands : dict[str, type[Exception]]|None, optional
+            dict med key-value-pairs hvor key er hvilken input fra bruker som raiser gitt exception gitt som value
+        
+        parent : CommandRegistry|None, optional
+            registry som slås opp i hvis input ikke er en kommando i dette
+
+        prefixMatching : bool, optional
+            om en entydig forkortelse av en kommando skal matche, f.eks "q" for "quit"
+
+        minPrefixLength : int, optional
+            minste antall tegn i en forkortelse
+
+        Raises
+        ------
+        TypeError
+            Hvis en key ikke er str eller en value ikke er en Exception
+
+        ValueError
+            Hvis minPrefixLength er mindre enn 1
+        """
+
+        if minPrefixLength < 1:
+            raise ValueError(f"minPrefixLength må være minst 1, fikk {minPrefixLength}")
+
+        self.__commands: dict[str, type[Exception]] = {}
+        self.__trie: list = [{}, 0] # node er [barn, antall kommandoer under noden]
+        self.__parent = parent
+        self.__prefixMatching = prefixMatching
+        self.__minPrefixLength = minPrefixLength
+
+        for cmd, exception in (commands or {}).items():
+            self.add(cmd, exception)
+
+
+    @property
+    def commands(self) -> dict[str, type[Exception]]:
+        """
+        Kommandoene i dette registry, uten parent
+        """
+        return dict(self.__commands)
+
+
+    def add(self, cmd: str, exception: type[Exception]) -> None:
+        """
+        Metode for å legge til eller erstatte en kommando
+
+        Parameters
+        ----------
+        cmd : str
+            input fra bruker som raiser exception. Gjøres til lowercase
+
+        exception : type[Exception]
+            exception som raises
+
+        Raises
+        ------
+        TypeError
+            Hvis cmd ikke er str eller exception ikke er en Exception
+        """
+
+        if not isinstance(exception, type) or not issubclass(exception, Exception): # sjekker om riktig exception er gitt
+            raise TypeError("Value i commands dict må være av typen Exception")
+
+        if not isinstance(cmd, str): # sjekker om cmd er string
+            raise TypeError("key i commands dict må være str")
+
+        cmd = cmd.lower()
+        if cmd not in self.__commands: # ny kommando, teller opp langs stien i trie
+            node = self.__trie
+            node[1] += 1
+            for char in cmd:
+                node = node[0].setdefault(char, [{}, 0])
+                node[1] += 1
+
+        self.__commands[cmd] = exception
+
+
+    def remove(self, cmd: str) -> None:
+        """
+        Metode for å fjerne en kommando
+
+        Raises
+        ------
+        KeyError
+            Hvis kommandoen ikke finnes i dette registry
+        """
+
+        cmd = cmd.lower()
+        del self.__commands[cmd]
+
+        node = self.__trie
+        node[1] -= 1
+        for char in cmd: # teller ned langs stien og fjerner noder uten kommandoer
+            child = node[0][char]
+            child[1] -= 1
+            if child[1] == 0:
+                del node[0][char]
+                return
+            node = child
+
+
+    def child(self, commands: dict[str, type[Exception]]|None = None) -> "CommandRegistry":
+        """
+        Metode for å lage et registry med dette som parent, med samme innstillinger for forkortelser
+
+        Parameters
+        ----------
+        commands : dict[str, type[Exception]]|None, optional
+            kommandoer som legges oppå kommandoene i dette registry
+
+        Returns
+        -------
+        CommandRegistry
+            nytt registry
+        """
+
+        return CommandRegistry(commands, self, self.__prefixMatching, self.__minPrefixLength)
+
+
+    def resolve(self, text: str) -> type[Exception]|None:
+        """
+        Metode for å finne exception for en input. Eksakte kommandoer går foran forkortelser, og nærmeste scope går foran parent
+
+        Parameters
+        ----------
+        text : str
+            formatert input fra bruker
+
+        Returns
+        -------
+        type[Exception]|None
+            exception for kommandoen, eller None hvis input ikke er en kommando eller er en tvetydig forkortelse
+        """
+
+        registry: CommandRegistry|None = self
+        while registry is not None: # eksakt oppslag i hvert scope, O(antall scopes)
+            exception = registry.__commands.get(text)
+            if exception is not None:
+                return exception
+            registry = registry.__parent
+
+        if not self.__prefixMatching or len(text) < self.__minPrefixLength:
+            return None
+
+        match: str|None = None
+        registry = self
+        while registry is not None:
+            completion = registry.__complete(text)
+            if completion == "": # flere kommandoer i samme scope starter med text
+                return None
+
+            if completion is not None:
+                if match is not None and match != completion: # ulike kommandoer i ulike scopes
+                    return None
+                match = completion
+
+            registry = registry.__parent
+
+        return self.resolve(match) if match is not None else None
+
+
+    def __complete(self, prefix: str) -> str|None:
+        """
+        Metode for å finne den ene kommandoen i dette registry som starter med prefix
+
+        Returns
+        -------
+        str|None
+            kommandoen, "" hvis flere kommandoer starter med prefix, eller None hvis ingen gjør det
+        """
+
+        node = self.__trie
+        for char in prefix:
+            node = node[0].get(char)
+            if node is None:
+                return None
+
+        if node[1] > 1:
+            return ""
+
+        completion = prefix
+        while completion not in self.__commands: # går ned den eneste stien til kommandoen
+            char, node = next(iter(node[0].items()))
+            completion += char
+
+        return completion
+
+
 class Init:
     """
     Klasse for å initalisere module
     """
     commands: dict[str, Exception] = {}
+    registry: CommandRegistry = CommandRegistry()
+    source: InputSource = ConsoleSource()
 
     @staticmethod
-    def setCommands(commands: dict[str, Exception]) -> None:
+    def setSource(source: InputSource) -> None:
+        """
+        Static method for å sette hvor alle Input objekter uten egen source leser fra
+
+        Parameters
+        ----------
+        source : InputSource
+            kilde, f.eks ConsoleSource, IteratorSource, StreamSource eller QueueSource
+
+        Raises
+        ------
+        TypeError
+            Hvis source ikke er en InputSource
+        """
+        if not isinstance(source, InputSource):
+            raise TypeError("source må være av typen InputSource")
+
+        Init.source = source
+
+    @staticmethod
+    def setCommands(commands: dict[str, Exception], prefixMatching: bool = False, minPrefixLength: int = 1) -> None:
         """
         Static method for å sette ulike kommandoer som raise gitt exception ved input
 
@@ -19,18 +533,235 @@ class Init:
         ----------
         commands : dict[str, ExitInputState|ExitProgram]
             dict med key-value-pairs hvor key er hvilken input fra bruker som raiser gitt exception gitt som value
+
+        prefixMatching : bool, optional
+            om en entydig forkortelse av en kommando skal matche, f.eks "q" for "quit"
+
+        minPrefixLength : int, optional
+            minste antall tegn i en forkortelse
         """
-        newDict: dict[str, Exception] = {} # lager ny dict for commands
-        for cmd, exception in commands.items(): # looper gjennom key-value-pairs i dict
-            if not issubclass(exception, Exception): # sjekker om riktig exception er gitt
-                raise TypeError("Value i commands dict må være av typen Exception")
+        registry = CommandRegistry(commands, prefixMatching=prefixMatching, minPrefixLength=minPrefixLength) # validerer og lager trie
 
-            if not isinstance(cmd, str): # sjekker om cmd er string
-                raise TypeError("key i commands dict må være str")
-            
-            newDict[cmd.lower()] = exception # setter key-value-pair for dict
+        Init.commands = registry.commands # setter commands til ny dict
+        Init.registry = registry
+
+    @staticmethod
+    @contextmanager
+    def scope(commands: dict[str, type[Exception]]) -> Iterator[CommandRegistry]:
+        """
+        Context manager for å legge kommandoer oppå de globale, f.eks for en meny. Scopes kan nøstes, og fjernes når blokken avsluttes
+
+        Parameters
+        ----------
+        commands : dict[str, type[Exception]]
+            kommandoer som gjelder i blokken
+
+        Examples
+        --------
+        >>> with Init.scope({"tilbake": ExitInputState}):
+        ...     choice = Input("Velg: ").case(menuCases)
+        """
+
+        previous = Init.registry
+        Init.registry = previous.child(commands)
+        try:
+            yield Init.registry
+
+        finally:
+            Init.registry = previous
+
+class CaseMatcher:
+    """
+    Klasse for å kompilere caser én gang til et oppslag fra formatert verdi til case, slik at samme caser kan brukes av mange Input.case kall med O(1) oppslag
+
+    Examples
+    --------
+    >>> foodMatcher = CaseMatcher({1: ["Taco", "Burrito", "Enchilada"], 2: ["Lasagne", "Pasta", "Pizza"], 3: ["Paella", "Gazpacho"]})
+    >>> foodMatcher.match("pizza")
+    2
+    >>> Input("Hva er din favorittmatrett? ").case(foodMatcher)
+    >>> CaseMatcher({1: ["Pizza"], 2: ["Pasta"]}, autoPick=0.6).match("piza")
+    1
+    """
+
+    def __init__(self, cases: dict[int|str, list[str]], fuzzy: bool = False, autoPick: float|None = None, suggestions: int = 3, strict: bool = True) -> None:
+        """
+        Initialiser CaseMatcher
+
+        Parameters
+        ----------
+        cases : dict[int|str, list[str]]
+            Dictionary for ulike caser. Verdiene gjøres til lowercase og whitespace fjernes, på samme måte som input fra bruker
+
+        fuzzy : bool, optional
+            om det skal bygges en trigram indeks over verdiene, slik at input som ikke matcher gir forslag til nærmeste caser i NoCaseMatchError
+
+        autoPick : float|None, optional
+            likhet mellom 0 og 1 hvor nærmeste case velges automatisk hvis den er entydig. Skrur på fuzzy
+
+        suggestions : int, optional
+            maks antall forslag
+
+        strict : bool, optional
+            om samme verdi i flere caser gir ValueError. Hvis False hører verdien til første case, slik som i Input.case med dict
+
+        Raises
+        ------
+        TypeError
+            Hvis en verdi i casene ikke er str
+
+        ValueError
+            Hvis strict er True og samme verdi finnes i flere caser, slik at det ikke er entydig hvilken case den hører til, eller autoPick ikke er mellom 0 og 1
+        """
+
+        if autoPick is not None and not 0 < autoPick <= 1:
+            raise ValueError(f"autoPick må være mellom 0 og 1, fikk {autoPick}")
+
+        lookup: dict[str, int|str] = {}
+        for case, values in cases.items(): # looper gjennom key-value-pairs i cases
+            for value in values:
+                if not isinstance(value, str):
+                    raise TypeError(f"Verdiene i cases må være str, fikk {type(value).__name__} i case {case!r}")
+
+                formatted = value.lower().strip()
+                if formatted in lookup: # samme verdi i to caser
+                    if strict and lookup[formatted] != case:
+                        raise ValueError(f'Verdien "{value}" finnes i både case {lookup[formatted]!r} og case {case!r}')
+                    continue # første case beholdes
+
+                lookup[formatted] = case
+
+        self.__lookup = lookup
+        self.__autoPick = autoPick
+        self.__suggestions = suggestions
+        self.__fuzzy = fuzzy or autoPick is not None
+        self.__index: dict[str, list[int]]|None = None # trigram -> indekser i self.__values, bygges én gang
+        self.__values: list[str] = []
+        self.__gramCounts: list[int] = []
+        if self.__fuzzy:
+            self.__buildIndex()
+
+
+    @staticmethod
+    def __grams(text: str) -> set[str]:
+        """
+        Metode for å dele tekst i trigrams, med mellomrom foran og bak slik at korte ord og starten av ord teller
+        """
+
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+    def __buildIndex(self) -> None:
+        """
+        Metode for å bygge invertert indeks fra trigram til verdiene som inneholder det
+        """
+
+        index: dict[str, list[int]] = {}
+        self.__values = list(self.__lookup)
+        self.__gramCounts = []
+        for position, value in enumerate(self.__values):
+            grams = self.__grams(value)
+            self.__gramCounts.append(len(grams))
+            for gram in grams:
+                index.setdefault(gram, []).append(position)
+
+        self.__index = index
+
+
+    def suggest(self, matchText: str, limit: int|None = None, minScore: float = 0.3) -> list[tuple[int|str, str, float]]:
+        """
+        Metode for å finne casene med verdier nærmest matchText. Bare verdier som deler minst ett trigram med matchText sammenlignes, 
+        så kostnaden avhenger av hvor mange verdier som ligner, ikke av hvor mange verdier det er totalt
+
+        Parameters
+        ----------
+        matchText : str
+            tekst som skal matches
+
+        limit : int|None, optional
+            maks antall forslag, bruker suggestions fra konstruktøren hvis None
+        
+        minScore : float, optional
+            minste likhet (Dice koeffisient over trigrams, mellom 0 og 1)
+
+        Returns
+        -------
+        list[tuple[int|str, str, float]]
+            (case, verdi, likhet) sortert etter likhet, med én verdi per case
+        """
+
+        if self.__index is None:
+            self.__buildIndex()
+
+        formatted = matchText.lower().strip()
+        grams = self.__grams(formatted)
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            shared.update(self.__index.get(gram, ())) # type: ignore teller delte trigrams per verdi
+
+        best: dict[int|str, tuple[str, float]] = {}
+        for position, count in shared.items():
+            score = 2 * count / (len(grams) + self.__gramCounts[position])
+            if score < minScore:
+                continue
+
+            value = self.__values[position]
+            case = self.__lookup[value]
+            if case not in best or score > best[case][1]: # beste verdi per case
+                best[case] = (value, score)
+
+        ranked = sorted(((case, value, score) for case, (value, score) in best.items()), key=lambda suggestion: -suggestion[2])
+        return ranked[:self.__suggestions if limit is None else limit]
+
+
+    def match(self, matchText: str) -> int|str:
+        """
+        Metode for å returnere case som matcher matchText
+
+        Parameters
+        ----------
+        matchText : str
+            tekst som skal matches, formateres på samme måte som verdiene i casene
+
+        Returns
+        -------
+        int|str
+            case som matcher
+
+        Raises
+        ------
+        NoCaseMatchError
+            Hvis matchText ikke stemmer overens med noen av casene og ikke kunne velges automatisk. Er en ValueError
+        """
+
+        try:
+            return self.__lookup[matchText.lower().strip()]
+
+        except KeyError:
+            pass
+
+        if not self.__fuzzy:
+            raise NoCaseMatchError("matchText stemmer ikke overens med noen av casene")
+
+        suggestions = self.suggest(matchText)
+        if self.__autoPick is not None and suggestions and suggestions[0][2] >= self.__autoPick:
+            if len(suggestions) == 1 or suggestions[1][2] < suggestions[0][2]: # bare hvis nærmeste case er entydig
+                return suggestions[0][0]
+
+        raise NoCaseMatchError("matchText stemmer ikke overens med noen av casene", suggestions)
+
+
+    def __contains__(self, matchText: str) -> bool:
+        return matchText.lower().strip() in self.__lookup
+
+
+    def __len__(self) -> int:
+        return len(self.__lookup)
+
+
+_NO_DEFAULT = object() # timeoutDefault er ikke gitt
 
-        Init.commands = newDict # setter commands til newDict
 
 class Input:
     """
@@ -47,12 +778,19 @@ class Input:
 
     Methods
     -------
-    cases(dict[int, list[str]])
+    case(dict[int, list[str]]|CaseMatcher)
         Get case for brukerinput
+    intArray(str|None, int|None, bool)
+        Linjer med heltall som array.array
+    floatArray(str|None, int|None, bool)
+        Linjer med desimaltall som array.array
+    acase(dict[int, list[str]]|CaseMatcher)
+        Async variant av case. Tilsvarende finnes aint, afloat og astr properties
    
     """
 
-    def __init__(self, inputText: str = "", strictMode: bool = False, inputErrorMsg: str = "Uglydig input", checkForCommands: bool = True) -> None:
+    def __init__(self, inputText: str = "", strictMode: bool = False, inputErrorMsg: str = "Uglydig input", checkForCommands: bool = True, source: InputSource|None = None, commands: CommandRegistry|None = None, 
+                 timeout: float|None = None, timeoutDefault: object = _NO_DEFAULT) -> None:
 
         """
         Initialiser input klasse
@@ -68,12 +806,31 @@ class Input:
 
         inputErrorMsg: str, optional
             Tekst som blir skrevet til bruker før bruker blir spurt om å taste inn input på nytt hvis strictMode er satt til False
+
+        source: InputSource|None, optional
+            Hvor input leses fra. Bruker Init.source hvis None, som er konsoll hvis ikke Init.setSource er kalt
+
+        commands: CommandRegistry|None, optional
+            Kommandoer som sjekkes. Bruker Init.registry hvis None, som er kommandoene fra Init.setCommands og aktive Init.scope blokker
+
+        timeout: float|None, optional
+            Maks antall sekunder de async variantene (.aint, .afloat, .astr, .acase) venter på gyldig input, inkludert nye forsøk i ikke strict mode
+
+        timeoutDefault: object, optional
+            Verdi som returneres ved timeout. TimeoutError raises hvis den ikke er gitt
         """
+
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"timeout må være positiv, fikk {timeout}")
     
         self.__inputText = inputText # text som blir printet før input
         self.__strictMode = strictMode # om strictMode
         self.__inputErrorMsg = inputErrorMsg # error msg on exception hvis strictMode er False
-        self.__checkForCommands = checkForCommands # om det skal sjekkes for spesielle kommandorer gitt fra Init.commands fra input for brukeren
+        self.__checkForCommands = checkForCommands # om det skal sjekkes for spesielle kommandorer gitt fra Init.registry fra input for brukeren
+        self.__source = source
+        self.__commands = commands
+        self.__timeout = timeout
+        self.__timeoutDefault = timeoutDefault
     
 
     def __input(self) -> str:
@@ -84,15 +841,78 @@ class Input:
         -------
         str
             formatted user input
+
+        Raises
+        ------
+        EOFError
+            Hvis kilden ikke har flere linjer
         """
 
+        source = self.__source if self.__source is not None else Init.source
         if self.__checkForCommands:
-            return self.__checkCommands(self.__format(input(self.__inputText)))
+            return self.__checkCommands(self.__format(source.readline(self.__inputText)))
 
         else: 
-            return self.__format(input(self.__inputText))
+            return self.__format(source.readline(self.__inputText))
             
 
+    async def __ainput(self) -> str:
+        """
+        Async variant av .__input som ikke blokkerer event loop
+
+        Returns
+        -------
+        str
+            formatted user input
+        """
+
+        source = self.__source if self.__source is not None else Init.source
+        formatted = self.__format(await source.areadline(self.__inputText))
+        return self.__checkCommands(formatted) if self.__checkForCommands else formatted
+
+
+    async def __aparse(self, parse: Callable[[str], object], errorMsg: Callable[[ValueError], str]) -> object:
+        """
+        Felles metode for async variantene. Leser og konverterer input med nye forsøk i ikke strict mode, innenfor timeout
+
+        Parameters
+        ----------
+        parse : Callable[[str], object]
+            funksjon som konverterer formatert input, og raiser ValueError hvis den er ugyldig
+
+        errorMsg : Callable[[ValueError], str]
+            funksjon som lager feilmeldingen som skrives før nytt forsøk
+
+        Raises
+        ------
+        TimeoutError
+            Hvis timeout er nådd og timeoutDefault ikke er gitt
+        """
+
+        async def attempt() -> object:
+            if self.__strictMode: # strict mode, ikke catch ValueError
+                return parse(await self.__ainput())
+
+            while True: # ikke strict mode, catch ValueError og be bruker på nytt
+                try:
+                    return parse(await self.__ainput())
+
+                except ValueError as e:
+                    print(errorMsg(e))
+
+        if self.__timeout is None:
+            return await attempt()
+
+        try:
+            return await asyncio.wait_for(attempt(), self.__timeout)
+
+        except asyncio.TimeoutError:
+            if self.__timeoutDefault is _NO_DEFAULT:
+                raise TimeoutError(f"Fikk ikke gyldig input innen {self.__timeout} sekunder") from None
+
+            return self.__timeoutDefault
+
+
     def __format(self, string: str) -> str:
         """
         Metode for å formatere text. Gjør til lowercase og fjerner whitespace
@@ -130,21 +950,22 @@ class Input:
         Gitt Exception i Init.setCommands hvis input fra bruker stemmer med en kommando 
         """
 
-        for cmd, exception in Init.commands.items(): # looper gjennom key-value-pairs i Init.commands for å sjekke om inputFromUser er lik en av kommandoene og rais da exception
-            if inputFromUser == cmd:
-                raise exception 
+        registry = self.__commands if self.__commands is not None else Init.registry
+        exception = registry.resolve(inputFromUser) # oppslag i dict, og trie for forkortelser hvis det er skrudd på
+        if exception is not None:
+            raise exception 
 
         return inputFromUser # hvis ikke exception ble raised, return inputFromUser    
 
 
-    def case(self, cases: dict[int|str, list[str]]) -> int|str:
+    def case(self, cases: dict[int|str, list[str]]|CaseMatcher) -> int|str:
         """
         Returner case (int|str) for bruker input
 
         Parameters
         ----------
-        cases: dict[int, list[str]]
-            Dictionary for ulike caser ut fra input
+        cases: dict[int, list[str]]|CaseMatcher
+            Dictionary for ulike caser ut fra input, eller CaseMatcher som kan gjenbrukes mellom flere kall. Dictionary blir ikke endret
         
         Returns
         -------
@@ -154,32 +975,187 @@ class Input:
         Raises
         ------
         ValueError
-            Hvis strictMode er True, og bruker taster inn input som ikke stemmer med noen av casene
+            Hvis strictMode er True, og bruker taster inn input som ikke stemmer med noen av casene (NoCaseMatchError).
+            For dict hører en verdi som finnes i flere caser til den første
         
         Examples
         --------
         >>> Input("Hva er din favorittmatrett? ").case({1: ["Taco", "Burrito", "Enchilada"], 2: ["Lasagne", "Pasta", "Pizza"], 3: ["Paella", "Gazpacho", "Paella"]})
         >>> pizza
-        3
+        2
         """
 
-        for key, valueList in cases.items(): # looper gjennom key-value-pairs i cases
-            newList = [] # ny liste for case values 
-            for value in valueList: # looper gjennom hver value i valueList
-                newList.append(self.__format(value)) # legger til formatert value til newList
-            
-            cases[key] = newList # oppdaterer values for key til newList
+        matcher = cases if isinstance(cases, CaseMatcher) else CaseMatcher(cases, strict=False) # kompilerer casene én gang per kall, i stedet for å formatere og søke lineært. Første case vinner, som før
 
         if self.__strictMode == True: # strict mode, ikke catch ValueError
-            return getCase(self.__input(), cases)
+            return matcher.match(self.__input())
 
         else: # ikke strict mode, catch ValueError og be bruker på nytt          
             while True:
                 try:
-                    return getCase(self.__input(), cases)
+                    return matcher.match(self.__input())
+
+                except NoCaseMatchError as e:
+                    print(self.__caseErrorMsg(e))
+
+
+    async def acase(self, cases: dict[int|str, list[str]]|CaseMatcher) -> int|str:
+        """
+        Async variant av .case som ikke blokkerer event loop, med timeout fra konstruktøren
+
+        Parameters
+        ----------
+        cases: dict[int, list[str]]|CaseMatcher
+            Dictionary for ulike caser ut fra input, eller CaseMatcher som kan gjenbrukes mellom flere kall
+        
+        Returns
+        -------
+        int|str
+            Tallet på case som matcher input, eller timeoutDefault ved timeout
+
+        Raises
+        ------
+        ValueError
+            Hvis strictMode er True, og bruker taster inn input som ikke stemmer med noen av casene
+        
+        TimeoutError
+            Hvis timeout er nådd og timeoutDefault ikke er gitt
+
+        Examples
+        --------
+        >>> choice = await Input("Fortsette (y/n)? ", timeout=10, timeoutDefault=2).acase({1: ["y"], 2: ["n"]})
+        """
+
+        matcher = cases if isinstance(cases, CaseMatcher) else CaseMatcher(cases, strict=False)
+        return await self.__aparse(matcher.match, self.__caseErrorMsg) # type: ignore
+
+
+    def __caseErrorMsg(self, error: NoCaseMatchError) -> str:
+        """
+        Metode for å lage feilmelding for input som ikke matcher noen case, med forslag hvis det finnes
+        """
+
+        if error.suggestions: # forslag fra CaseMatcher med fuzzy
+            return f"{self.__inputErrorMsg}. Mente du {' eller '.join(repr(value) for _, value, _ in error.suggestions)}?"
+
+        return self.__inputErrorMsg
+
+    def intArray(self, separator: str|None = None, lines: int|None = 1, asNumpy: bool = False) -> "array.array[int]":
+        """
+        Metode for å lese linjer med heltall i ett kall, f.eks "1 2 3" eller "1,2,3"
+
+        Parameters
+        ----------
+        separator : str|None, optional
+            tegn mellom tallene, None for whitespace
+        
+        lines : int|None, optional
+            antall linjer som skal leses, None for å lese til kilden er tom
+
+        asNumpy : bool, optional
+            returner numpy.ndarray med dtype int64 i stedet for array.array, uten kopiering
+
+        Returns
+        -------
+        array.array[int]
+            array.array med typecode "q", eller numpy.ndarray hvis asNumpy er True
+
+        Raises
+        ------
+        NumberParseError
+            Hvis et tall ikke kan konverteres og strictMode er True eller kilden ikke er en terminal, med linje, felt og kolonne for tallet.
+            Ellers bes bruker om linjen på nytt
+        
+        ImportError
+            Hvis asNumpy er True og numpy ikke er installert
+        """
+
+        return self.__numberArray(int, "q", separator, lines, asNumpy)
+
+
+    def floatArray(self, separator: str|None = None, lines: int|None = 1, asNumpy: bool = False) -> "array.array[float]":
+        """
+        Metode for å lese linjer med desimaltall i ett kall, f.eks "1.5 2 3e-4"
+
+        Parameters
+        ----------
+        separator : str|None, optional
+            tegn mellom tallene, None for whitespace
+        
+        lines : int|None, optional
+            antall linjer som skal leses, None for å lese til kilden er tom
+
+        asNumpy : bool, optional
+            returner numpy.ndarray med dtype float64 i stedet for array.array, uten kopiering
+
+        Returns
+        -------
+        array.array[float]
+            array.array med typecode "d", eller numpy.ndarray hvis asNumpy er True
+
+        Raises
+        ------
+        NumberParseError
+            Hvis et tall ikke kan konverteres og strictMode er True eller kilden ikke er en terminal, med linje, felt og kolonne for tallet.
+            Ellers bes bruker om linjen på nytt
+        
+        ImportError
+            Hvis asNumpy er True og numpy ikke er installert
+        """
+
+        return self.__numberArray(float, "d", separator, lines, asNumpy)
+
+
+    def __numberArray(self, numberType: type, typecode: str, separator: str|None, lines: int|None, asNumpy: bool) -> "array.array":
+        """
+        Felles metode for .intArray og .floatArray
+        """
+
+        if asNumpy and numpy is None:
+            raise ImportError("asNumpy krever at numpy er installert")
+
+        if lines is not None and lines < 0:
+            raise ValueError(f"lines kan ikke være negativ, fikk {lines}")
+
+        source = self.__source if self.__source is not None else Init.source
+        retry = not self.__strictMode and isinstance(source, ConsoleSource) and sys.stdin is not None and sys.stdin.isatty() # bare en bruker i terminal kan skrive linjen på nytt. Fra script eller pipe er neste linje data
+
+        values = array.array(typecode)
+        lineNumber = 0
+        exhausted = False # kilden ble tom mens en linje ble bedt om på nytt
+        while not exhausted and (lines is None or lineNumber < lines):
+            try:
+                text = self.__input()
+
+            except EOFError:
+                if lines is None: # leser til kilden er tom
+                    break
+                raise
+
+            lineNumber += 1
+            while True:
+                try:
+                    values.extend(parseNumbers(text, numberType, separator, lineNumber))
+                    break
+
+                except NumberParseError as e:
+                    if not retry: # strict mode eller ikke terminal, ikke catch NumberParseError
+                        raise
+
+                    print(f"{self.__inputErrorMsg}. {e}")
+                    try:
+                        text = self.__input() # ber om linjen på nytt, telles ikke som en ny linje
+                    except EOFError:
+                        if lines is None: # beholder tallene som er lest
+                            exhausted = True
+                            break
+                        raise
+
+        if asNumpy:
+            return numpy.frombuffer(values, dtype=numpy.int64 if typecode == "q" else numpy.float64)
+
+        return values
 
-                except ValueError:
-                    print(self.__inputErrorMsg)
 
     @property
     def int(self) -> int:
@@ -220,10 +1196,10 @@ class Input:
         else: # ikke strict mode, catch ValueError og be bruker på nytt
             while True:
                 try:
-                    return int(self.__input())
+                    return float(self.__input())
 
                 except ValueError:
-                    float(self.__inputErrorMsg + ". Må kunne konverteres til float")
+                    print(self.__inputErrorMsg + ". Må kunne konverteres til float")
     
     @property
     def str(self) -> str:
@@ -233,15 +1209,61 @@ class Input:
 
         return self.__input()
 
+    @property
+    def aint(self) -> "Awaitable[int]":
+        """
+        Async variant av .int som ikke blokkerer event loop. Brukes med await, f.eks await Input("Antall: ", timeout=5, timeoutDefault=1).aint
+
+        Raises
+        ------
+        ValueError
+            Hvis strictMode er True og input fra bruker ikke kan konverteres til int
+
+        TimeoutError
+            Hvis timeout er nådd og timeoutDefault ikke er gitt
+        """
+
+        return self.__aparse(int, lambda e: self.__inputErrorMsg + ". Må kunne konverteres til int") # type: ignore
+
+    @property
+    def afloat(self) -> "Awaitable[float]":
+        """
+        Async variant av .float som ikke blokkerer event loop
+
+        Raises
+        ------
+        ValueError
+            Hvis strictMode er True og input fra bruker ikke kan konverteres til float
+
+        TimeoutError
+            Hvis timeout er nådd og timeoutDefault ikke er gitt
+        """
+
+        return self.__aparse(float, lambda e: self.__inputErrorMsg + ". Må kunne konverteres til float") # type: ignore
+
+    @property
+    def astr(self) -> "Awaitable[str]":
+        """
+        Async variant av .str som ikke blokkerer event loop
+
+        Raises
+        ------
+        TimeoutError
+            Hvis timeout er nådd og timeoutDefault ikke er gitt
+        """
+
+        return self.__aparse(lambda text: text, lambda e: self.__inputErrorMsg) # type: ignore
 
-def getCase(matchText: str, cases: dict[int|str, list[str]]) -> int|str:
+
+def getCase(matchText: str, cases: dict[int|str, list[str]]|CaseMatcher) -> int|str:
     """
     Funksjon for å returnere key på case hvis matchText stemmer overens med en av verdiene i casene
 
     Parameters
     ----------
-    cases: dict[int, list[str]]
-        Dictionary for ulike caser ut fra matchText
+    cases: dict[int, list[str]]|CaseMatcher
+        Dictionary for ulike caser ut fra matchText, som sammenlignes uten formatering. 
+        Bruk CaseMatcher for O(1) oppslag når de samme casene brukes flere ganger
         
     Returns
     -------
@@ -254,8 +1276,81 @@ def getCase(matchText: str, cases: dict[int|str, list[str]]) -> int|str:
         Hvis matchText ikke stemmer overens med noen av casene
     """
 
+    if isinstance(cases, CaseMatcher):
+        return cases.match(matchText)
+
     for key, values in cases.items(): # looper gjennom caser
         if matchText in values: # sjekker om bruker input matcher en av de godkjente verdiene til casene
             return key # returnerer key på case
 
-    raise ValueError("matchText stemmer ikke overens med noen av casene")
\ No newline at end of file
+    raise ValueError("matchText stemmer ikke overens med noen av casene")
+
+
+def parseNumbers(text: str, numberType: type = float, separator: str|None = None, line: int = 1) -> "array.array":
+    """
+    Funksjon for å konvertere en linje med tall til array.array i ett kall. Tallene konverteres i C, og posisjonen til feil finnes bare hvis noe feiler
+
+    Parameters
+    ----------
+    text : str
+        linjen med tall
+    
+    numberType : type, optional
+        int eller float
+    
+    separator : str|None, optional
+        tegn mellom tallene, None for whitespace
+
+    line : int, optional
+        linjenummer som brukes i feilmeldinger
+
+    Returns
+    -------
+    array.array
+        array.array med typecode "q" for int og "d" for float. Tom hvis linjen er tom
+
+    Raises
+    ------
+    TypeError
+        Hvis numberType ikke er int eller float
+
+    NumberParseError
+        Hvis et tall ikke kan konverteres eller er for stort for int64
+
+    Examples
+    --------
+    >>> parseNumbers("1, 2, 3", int, ",")
+    array('q', [1, 2, 3])
+    """
+
+    if numberType is int:
+        typecode = "q"
+    elif numberType is float:
+        typecode = "d"
+    else:
+        raise TypeError(f"numberType må være int eller float, ikke {numberType}")
+
+    if not text or text.isspace():
+        return array.array(typecode)
+
+    fields = text.split(separator)
+    try:
+        return array.array(typecode, map(numberType, fields))
+
+    except (ValueError, OverflowError):
+        pass
+
+    column = 0 # finner hvilket felt som feilet
+    for index, field in enumerate(fields):
+        if separator is None:
+            column = text.index(field, column)
+
+        try:
+            array.array(typecode, [numberType(field)])
+
+        except (ValueError, OverflowError):
+            raise NumberParseError(f'Ugyldig {numberType.__name__} "{field.strip()}" på linje {line}, felt {index + 1}, kolonne {column + 1}', line, index + 1, column + 1) from None
+
+        column += len(field) + (len(separator) if separator is not None else 0)
+
+    raise NumberParseError(f"Ugyldig linje {line}", line, 0, 0) # skal ikke skje